@@ -1,23 +1,69 @@
-from sqlalchemy import create_engine
+from contextlib import contextmanager
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import declarative_base, sessionmaker
-import os
-from dotenv import load_dotenv
-
-# Cargar variables de entorno
-load_dotenv()
+from database.instrumentation import instrument_engine, guard_lazy_loads
+from config.settings import (
+    DATABASE_URL, DB_ECHO,
+    SQLITE_JOURNAL_MODE, SQLITE_SYNCHRONOUS, SQLITE_BUSY_TIMEOUT_MS,
+    SQLITE_MMAP_SIZE, SQLITE_CACHE_SIZE_KB,
+    DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_RECYCLE, DB_POOL_PRE_PING
+)
 
 Base = declarative_base()
 
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+    """Aplica los pragmas de SQLite a cada conexión nueva"""
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(f"PRAGMA journal_mode={SQLITE_JOURNAL_MODE}")
+        cursor.execute(f"PRAGMA synchronous={SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA busy_timeout={int(SQLITE_BUSY_TIMEOUT_MS)}")
+        cursor.execute(f"PRAGMA mmap_size={int(SQLITE_MMAP_SIZE)}")
+        # Un valor negativo indica el tamaño en KiB en lugar de páginas
+        cursor.execute(f"PRAGMA cache_size=-{int(SQLITE_CACHE_SIZE_KB)}")
+    finally:
+        cursor.close()
+
+
+def create_db_engine(url: str = DATABASE_URL, echo: bool = DB_ECHO) -> Engine:
+    """Crea el motor de la base de datos según la configuración"""
+    if url.startswith("sqlite"):
+        engine = create_engine(
+            url,
+            echo=echo,
+            connect_args={
+                "check_same_thread": False,
+                "timeout": SQLITE_BUSY_TIMEOUT_MS / 1000,
+            },
+        )
+        event.listen(engine, "connect", _apply_sqlite_pragmas)
+        return instrument_engine(engine)
+
+    return instrument_engine(create_engine(
+        url,
+        echo=echo,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=DB_POOL_PRE_PING,
+    ))
+
+
 # Crear el motor de la base de datos
-DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///database.db")
-engine = create_engine(DATABASE_URL, echo=True)
+engine = create_db_engine()
 
 # Configurar la sesión
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = guard_lazy_loads(
+    sessionmaker(autocommit=False, autoflush=False, bind=engine))
 
 def init_db():
     """Inicializa la base de datos creando todas las tablas"""
+    from database.migrations import run_migrations, schema_is_current
+
     # Importar todos los modelos aquí para asegurar que están registrados
+    # (las relationship() declaradas por nombre los necesitan aunque se omita create_all)
     from models.User import User
     from models.Customer import Customer
     from models.Product import Product
@@ -28,14 +74,35 @@ def init_db():
     from models.CommercialInvoice import CommercialInvoice
     from models.Administrator import Administrator
     from models.Employee import Employee
-    
+    from models.DailySalesSummary import DailySalesSummary
+
+    # Si el esquema está al día se evita ejecutar create_all
+    if schema_is_current(engine):
+        return
+
     # Crear todas las tablas
     Base.metadata.create_all(bind=engine)
 
+    # Aplicar migraciones pendientes (índices, etc.)
+    run_migrations(engine)
+
 def get_db():
     """Proporciona una sesión de base de datos"""
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+@contextmanager
+def session_scope():
+    """Proporciona una sesión de corta duración para tareas en segundo plano"""
+    db = SessionLocal()
+    try:
+        yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
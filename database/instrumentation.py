@@ -0,0 +1,275 @@
+"""
+Instrumentación de consultas: cantidad y tiempo por ruta y método de servicio
+"""
+import contextvars
+import functools
+import inspect
+import logging
+import threading
+import time
+from typing import Callable, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from config.settings import (
+    QUERY_STATS_ENABLED, SLOW_QUERY_THRESHOLD_MS, SLOW_QUERY_LOG,
+    LAZY_LOAD_GUARD, LAZY_LOAD_LIMIT
+)
+
+# Valor usado cuando la consulta no ocurre dentro de una ruta o un método de servicio
+UNKNOWN = "-"
+
+# Longitud máxima de los parámetros escritos en el log de consultas lentas
+MAX_LOGGED_PARAMETERS = 500
+
+# Método de servicio en ejecución en el hilo actual
+_current_method = contextvars.ContextVar("current_service_method", default=None)
+# Cargas diferidas por relación dentro de la llamada de servicio en curso
+_lazy_loads = contextvars.ContextVar("service_lazy_loads", default=None)
+
+slow_query_logger = logging.getLogger("database.slow_queries")
+
+
+class LazyLoadError(Exception):
+    """Se lanza en modo estricto cuando una relación se carga de forma diferida en un bucle"""
+
+
+class Navigation:
+    """Ruta de una navegación y lo que se consultó desde que empezó"""
+
+    def __init__(self, route: str):
+        self.route = route
+        self.queries = 0
+        # Cargas diferidas fuera de los servicios, por relación
+        self.lazy_loads = {}
+
+
+class QueryStats:
+    """
+    Acumula cantidad y tiempo de las consultas por ruta y por método de
+    servicio. La ruta se toma de la navegación que devuelve la fuente
+    registrada con set_navigation_source (la aplicación la guarda por
+    cliente); sin fuente, las consultas se atribuyen a UNKNOWN.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.total = 0
+        # ruta -> método -> [cantidad, tiempo total en ms, tiempo máximo en ms]
+        self._routes = {}
+        # Cargas diferidas fuera de toda navegación y de los servicios
+        self._unattributed_lazy_loads = {}
+        # (ruta, método, relación) -> máximo de cargas diferidas detectadas
+        self._n_plus_one = {}
+        self._navigation_source = None
+
+    def set_navigation_source(self, source: Callable[[], Optional[Navigation]]) -> None:
+        """Registra la función que devuelve la navegación del cliente que ejecuta la consulta"""
+        self._navigation_source = source
+
+    def start_navigation(self, route: str) -> Navigation:
+        """Crea la navegación a la ruta indicada; quien la inicia la guarda por cliente"""
+        return Navigation(route or UNKNOWN)
+
+    def current_navigation(self) -> Optional[Navigation]:
+        return self._navigation_source() if self._navigation_source else None
+
+    def navigation_queries(self) -> int:
+        """Consultas ejecutadas desde la última navegación del cliente actual"""
+        navigation = self.current_navigation()
+        with self._lock:
+            return navigation.queries if navigation else 0
+
+    def record(self, method: str, elapsed_ms: float) -> str:
+        """Registra una consulta y devuelve la ruta a la que se atribuyó"""
+        navigation = self.current_navigation()
+        route = navigation.route if navigation else UNKNOWN
+        with self._lock:
+            entry = self._routes.setdefault(route, {}).setdefault(method, [0, 0.0, 0.0])
+            entry[0] += 1
+            entry[1] += elapsed_ms
+            entry[2] = max(entry[2], elapsed_ms)
+            self.total += 1
+            if navigation:
+                navigation.queries += 1
+            return route
+
+    def record_lazy_load(self, relationship: str) -> tuple:
+        """Cuenta una carga diferida y devuelve (ruta, cantidad en la llamada actual)"""
+        navigation = self.current_navigation()
+        route = navigation.route if navigation else UNKNOWN
+        scope = _lazy_loads.get()
+        with self._lock:
+            if scope is None:
+                scope = navigation.lazy_loads if navigation else self._unattributed_lazy_loads
+            scope[relationship] = count = scope.get(relationship, 0) + 1
+            if count > LAZY_LOAD_LIMIT:
+                key = (route, current_method(), relationship)
+                self._n_plus_one[key] = max(self._n_plus_one.get(key, 0), count)
+            return route, count
+
+    def n_plus_one(self) -> dict:
+        """Relaciones cargadas de forma diferida en bucle: (ruta, método, relación) -> cantidad"""
+        with self._lock:
+            return dict(self._n_plus_one)
+
+    def route_counts(self) -> dict:
+        """Cantidad de consultas por ruta"""
+        with self._lock:
+            return {
+                route: sum(entry[0] for entry in methods.values())
+                for route, methods in self._routes.items()
+            }
+
+    def snapshot(self) -> dict:
+        """Detalle por ruta y método: cantidad, tiempo total y máximo"""
+        with self._lock:
+            return {
+                route: {
+                    method: {
+                        "count": count,
+                        "total_ms": round(total_ms, 3),
+                        "max_ms": round(max_ms, 3),
+                    }
+                    for method, (count, total_ms, max_ms) in methods.items()
+                }
+                for route, methods in self._routes.items()
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self.total = 0
+            self._routes.clear()
+            self._unattributed_lazy_loads.clear()
+            self._n_plus_one.clear()
+
+
+# Estadísticas compartidas por todas las sesiones del proceso
+query_stats = QueryStats()
+
+
+def current_method() -> str:
+    return _current_method.get() or UNKNOWN
+
+
+def track_queries(cls):
+    """
+    Decorador de clase: atribuye las consultas de cada método público al
+    método de servicio. En llamadas anidadas se conserva el método externo.
+    Cada llamada externa es además el ámbito en el que se cuentan las cargas
+    diferidas para detectar N+1.
+    """
+    if not QUERY_STATS_ENABLED and LAZY_LOAD_GUARD not in ("warn", "raise"):
+        return cls
+
+    def wrap(name, method):
+        qualified_name = f"{cls.__name__}.{name}"
+
+        if inspect.isgeneratorfunction(method):
+            # Las consultas de un generador ocurren al iterarlo: se atribuyen paso a paso
+            @functools.wraps(method)
+            def generator_wrapper(*args, **kwargs):
+                iterator = method(*args, **kwargs)
+                lazy_loads = {}
+                while True:
+                    outermost = _current_method.get() is None
+                    if outermost:
+                        token = _current_method.set(qualified_name)
+                        lazy_loads_token = _lazy_loads.set(lazy_loads)
+                    try:
+                        item = next(iterator)
+                    except StopIteration:
+                        return
+                    finally:
+                        if outermost:
+                            _lazy_loads.reset(lazy_loads_token)
+                            _current_method.reset(token)
+                    yield item
+            return generator_wrapper
+
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            if _current_method.get() is not None:
+                return method(*args, **kwargs)
+            token = _current_method.set(qualified_name)
+            lazy_loads_token = _lazy_loads.set({})
+            try:
+                return method(*args, **kwargs)
+            finally:
+                _lazy_loads.reset(lazy_loads_token)
+                _current_method.reset(token)
+        return wrapper
+
+    for name, attribute in list(vars(cls).items()):
+        if name.startswith("_"):
+            continue
+        if isinstance(attribute, staticmethod):
+            setattr(cls, name, staticmethod(wrap(name, attribute.__func__)))
+        elif callable(attribute):
+            setattr(cls, name, wrap(name, attribute))
+    return cls
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed_ms = (time.perf_counter() - conn.info["query_start_time"].pop()) * 1000
+    method = current_method()
+    route = query_stats.record(method, elapsed_ms)
+    if elapsed_ms >= SLOW_QUERY_THRESHOLD_MS:
+        slow_query_logger.warning(
+            "%.1f ms | ruta=%s | método=%s | %s | parámetros=%s",
+            elapsed_ms, route, method, " ".join(statement.split()),
+            repr(parameters)[:MAX_LOGGED_PARAMETERS]
+        )
+
+
+def _handle_error(exception_context):
+    # La consulta falló: descartar su tiempo de inicio
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("query_start_time"):
+        connection.info["query_start_time"].pop()
+
+
+def _configure_slow_query_log():
+    if SLOW_QUERY_LOG and not slow_query_logger.handlers:
+        handler = logging.FileHandler(SLOW_QUERY_LOG, encoding="utf-8", delay=True)
+        handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+        slow_query_logger.addHandler(handler)
+        slow_query_logger.propagate = False
+
+
+def _check_lazy_load(orm_execute_state):
+    # Solo interesan las cargas diferidas, no las de selectinload/joinedload
+    if not orm_execute_state.is_relationship_load or orm_execute_state.lazy_loaded_from is None:
+        return
+    relationship = str(orm_execute_state.loader_strategy_path[-1])
+    route, count = query_stats.record_lazy_load(relationship)
+    # Se informa una sola vez por llamada, al superar el límite
+    if count != LAZY_LOAD_LIMIT + 1:
+        return
+    message = (
+        f"Posible N+1: {relationship} se cargó de forma diferida {count} veces "
+        f"(ruta={route}, método={current_method()})"
+    )
+    if LAZY_LOAD_GUARD == "raise":
+        raise LazyLoadError(message)
+    logging.warning(message)
+
+
+def guard_lazy_loads(session_factory):
+    """Detecta relaciones cargadas de forma diferida dentro de un bucle (N+1)"""
+    if LAZY_LOAD_GUARD in ("warn", "raise"):
+        event.listen(session_factory, "do_orm_execute", _check_lazy_load)
+    return session_factory
+
+
+def instrument_engine(engine: Engine) -> Engine:
+    """Registra los eventos que cuentan y miden las consultas del motor"""
+    if QUERY_STATS_ENABLED:
+        _configure_slow_query_log()
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
+    return engine
@@ -0,0 +1,131 @@
+"""
+Migraciones versionadas del esquema de la base de datos
+"""
+from datetime import datetime
+from sqlalchemy import (
+    Column, DateTime, Integer, MetaData, String, Table, bindparam, inspect, select, text
+)
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.schema import CreateIndex
+
+migrations_metadata = MetaData()
+
+schema_migrations = Table(
+    'schema_migrations',
+    migrations_metadata,
+    Column('version', Integer, primary_key=True),
+    Column('name', String, nullable=False),
+    Column('applied_at', DateTime, nullable=False, default=datetime.utcnow),
+)
+
+
+def _create_query_indexes(connection: Connection):
+    """Crea los índices de las columnas consultadas con mayor frecuencia"""
+    from models.Product import Product
+    from models.Sale import Sale
+    from models.SaleItem import SaleItem
+
+    for model in (Sale, SaleItem, Product):
+        for index in model.__table__.indexes:
+            connection.execute(CreateIndex(index, if_not_exists=True))
+
+
+def _create_product_search(connection: Connection):
+    """Crea el índice de búsqueda de texto completo de productos"""
+    from database.search import create_product_search_index
+    create_product_search_index(connection)
+
+
+def _create_customer_indexes(connection: Connection):
+    """Crea los índices de búsqueda de clientes por nombre y email"""
+    from models.Customer import Customer
+
+    for index in Customer.__table__.indexes:
+        connection.execute(CreateIndex(index, if_not_exists=True))
+
+
+def _rebuild_sales_summary(connection: Connection):
+    """
+    Recrea el resumen diario con employee_id obligatorio y lo reconstruye
+    desde las ventas. SQLite no permite alterar la columna en el lugar.
+    """
+    from models.DailySalesSummary import DailySalesSummary
+    from services.salesSummaryService import SalesSummaryService
+
+    DailySalesSummary.__table__.drop(connection, checkfirst=True)
+    DailySalesSummary.__table__.create(connection)
+    with Session(bind=connection) as db:
+        SalesSummaryService(db).rebuild()
+
+
+def _drop_redundant_indexes(connection: Connection):
+    """
+    Elimina ix_sales_date, cubierto por ix_sales_date_status, e
+    ix_product_name_lower, que ninguna consulta aprovecha
+    """
+    for name in ("ix_sales_date", "ix_product_name_lower"):
+        connection.execute(text(f"DROP INDEX IF EXISTS {name}"))
+
+
+def _add_customer_name_key(connection: Connection):
+    """Agrega y completa la columna name_key de clientes, con su índice"""
+    from models.Customer import Customer, search_key
+
+    table = Customer.__table__
+    if 'name_key' not in {column['name'] for column in inspect(connection).get_columns(table.name)}:
+        connection.execute(text(f"ALTER TABLE {table.name} ADD COLUMN name_key VARCHAR"))
+    rows = connection.execute(
+        select(table.c.id, table.c.name).where(table.c.name_key.is_(None))).all()
+    if rows:
+        connection.execute(
+            table.update().where(table.c.id == bindparam('customer_id')),
+            [{"customer_id": customer_id, "name_key": search_key(name)} for customer_id, name in rows]
+        )
+    for index in table.indexes:
+        connection.execute(CreateIndex(index, if_not_exists=True))
+
+
+# Lista ordenada de migraciones: (versión, nombre, función).
+# Todo cambio de modelos (tablas, columnas o índices) debe agregar una migración:
+# init_db omite create_all cuando todas las versiones ya están aplicadas.
+MIGRATIONS = [
+    (1, "indices_consultas_frecuentes", _create_query_indexes),
+    (2, "busqueda_productos", _create_product_search),
+    (3, "indices_clientes", _create_customer_indexes),
+    (4, "resumen_ventas_clave_no_nula", _rebuild_sales_summary),
+    (5, "eliminar_indices_redundantes", _drop_redundant_indexes),
+    (6, "clave_busqueda_clientes", _add_customer_name_key),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def get_applied_versions(connection: Connection) -> set:
+    """Obtiene las versiones de migración ya aplicadas"""
+    schema_migrations.create(bind=connection, checkfirst=True)
+    return set(connection.execute(select(schema_migrations.c.version)).scalars())
+
+
+def schema_is_current(engine: Engine) -> bool:
+    """Indica si la base de datos ya tiene aplicadas todas las migraciones"""
+    with engine.connect() as connection:
+        if not inspect(connection).has_table(schema_migrations.name):
+            return False
+        done = set(connection.execute(select(schema_migrations.c.version)).scalars())
+    return all(version in done for version, _, _ in MIGRATIONS)
+
+
+def run_migrations(engine: Engine) -> list:
+    """Aplica las migraciones pendientes y las registra en schema_migrations"""
+    applied = []
+    with engine.begin() as connection:
+        done = get_applied_versions(connection)
+        for version, name, migrate in MIGRATIONS:
+            if version in done:
+                continue
+            migrate(connection)
+            connection.execute(schema_migrations.insert().values(
+                version=version, name=name, applied_at=datetime.utcnow()))
+            applied.append(version)
+    return applied
@@ -0,0 +1,55 @@
+"""
+Índice de búsqueda de texto completo para productos
+"""
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+PRODUCT_SEARCH_TABLE = "product_search"
+
+# Longitud mínima para usar el índice de trigramas
+MIN_TRIGRAM_QUERY = 3
+
+# Motores en los que ya existe la tabla FTS5. Solo se recuerdan los
+# resultados positivos: la tabla puede crearla una migración posterior
+_engines_with_search = set()
+
+
+def create_product_search_index(connection: Connection):
+    """Crea y llena el índice de búsqueda de productos según el motor"""
+    dialect = connection.dialect.name
+    if dialect == "sqlite":
+        connection.execute(text(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {PRODUCT_SEARCH_TABLE} "
+            "USING fts5(name, tokenize='trigram')"
+        ))
+        connection.execute(text(f"DELETE FROM {PRODUCT_SEARCH_TABLE}"))
+        connection.execute(text(
+            f"INSERT INTO {PRODUCT_SEARCH_TABLE}(rowid, name) SELECT id, name FROM product"
+        ))
+    elif dialect == "postgresql":
+        connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        connection.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_product_name_trgm "
+            "ON product USING gin (name gin_trgm_ops)"
+        ))
+
+
+def product_search_available(engine: Engine) -> bool:
+    """Indica si existe la tabla FTS5 de productos (solo SQLite)"""
+    if engine.dialect.name != "sqlite":
+        return False
+    if engine in _engines_with_search:
+        return True
+    with engine.connect() as connection:
+        available = connection.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {"name": PRODUCT_SEARCH_TABLE}
+        ).first() is not None
+    if available:
+        _engines_with_search.add(engine)
+    return available
+
+
+def fts_phrase(query: str) -> str:
+    """Convierte el texto ingresado en una frase FTS5 segura"""
+    return '"' + query.replace('"', '""') + '"'
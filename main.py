@@ -1,24 +1,100 @@
+import importlib
+import sys
+import time
+
+# Con --profile-startup se informa cuánto tardan las importaciones y la inicialización
+PROFILE_STARTUP = "--profile-startup" in sys.argv
+_startup_marks = [("inicio", time.perf_counter())]
+
+
+def mark_startup(label):
+    """Registra el tiempo transcurrido hasta un paso del arranque"""
+    if PROFILE_STARTUP:
+        _startup_marks.append((label, time.perf_counter()))
+
+
+def report_startup():
+    """Muestra el tiempo de cada paso del arranque"""
+    if not PROFILE_STARTUP:
+        return
+    print("Perfil de arranque:")
+    for (_, previous), (label, current) in zip(_startup_marks, _startup_marks[1:]):
+        print(f"  {label:<35} {(current - previous) * 1000:8.1f} ms")
+    total = _startup_marks[-1][1] - _startup_marks[0][1]
+    print(f"  {'total':<35} {total * 1000:8.1f} ms")
+
+
 import flet
+from collections import OrderedDict
 from flet import Page
+mark_startup("import flet")
+import logging
+from config.settings import VIEW_CACHE_SIZE, ROUTE_QUERY_WARNING
 from database.connection import init_db, SessionLocal
-from pages.product.PageProduct import PageProduct
-from pages.product.PageProductForm import PageProductForm
-from pages.supplier.PageSupplier import PageSupplier
-from pages.supplier.PageSupplierForm import PageSupplierForm
-from pages.customer.PageCustomer import PageCustomer
-from pages.customer.PageCustomerForm import PageCustomerForm
-from pages.sales.make_sale import MakeSaleView
-#from pages.sales.see_sales import SeeSalesView
-from pages.auth import LoginView
-from pages.auth import RegisterView
-from pages.auth import ResetPasswordView
-from pages.dashboard.dashboard import DashboardView
-from pages.sales.PageSeeSale import SeeSalesView
-# Inicializar la base de datos
+from database.instrumentation import query_stats
+mark_startup("import database")
+
+# Clave de page.session con la navegación en curso de cada cliente
+NAVIGATION_SESSION_KEY = "query_navigation"
+
+
+def current_navigation():
+    """
+    Navegación del cliente que ejecuta la consulta. Flet indica la página en
+    cada manejador, y los hilos de trabajo la heredan al copiar el contexto.
+    """
+    page = flet.context.page
+    if page is None or page.session is None:
+        return None
+    return page.session.get(NAVIGATION_SESSION_KEY)
+
+
+query_stats.set_navigation_source(current_navigation)
+
+# Inicializar la base de datos (omite create_all si el esquema está al día)
 init_db()
+mark_startup("init_db")
+
+# Registro de rutas: ruta -> (módulo, clase, argumentos). Cada página se
+# importa recién cuando se visita por primera vez.
+ROUTES = {
+    "/login": ("pages.auth.login", "LoginView", {}),
+    # "/register": ("pages.auth.register", "RegisterView", {}),
+    # "/reset-password": ("pages.auth.reset_password", "ResetPasswordView", {}),
+    "/dashboard": ("pages.dashboard.dashboard", "DashboardView", {}),
+    "/realizar_venta": ("pages.sales.make_sale", "MakeSaleView", {}),
+    "/ver_productos": ("pages.product.PageProduct", "PageProduct", {}),
+    "/agregar_productos": ("pages.product.PageProductForm", "PageProductForm", {}),
+    "/ver_proveedores": ("pages.supplier.PageSupplier", "PageSupplier", {}),
+    "/agregar_proveedor": ("pages.supplier.PageSupplierForm", "PageSupplierForm", {"edit_mode": False}),
+    "/editar_proveedor": ("pages.supplier.PageSupplierForm", "PageSupplierForm", {"edit_mode": True}),
+    "/ver_compradores": ("pages.customer.PageCustomer", "PageCustomer", {}),
+    "/agregar_comprador": ("pages.customer.PageCustomerForm", "PageCustomerForm", {"edit_mode": False}),
+    "/editar_comprador": ("pages.customer.PageCustomerForm", "PageCustomerForm", {"edit_mode": True}),
+    "/ver_ventas": ("pages.sales.PageSeeSale", "SeeSalesView", {}),
+}
+
 
-# Crear una sesión
-session = SessionLocal()
+def load_view_class(route):
+    """Importa el módulo de la página la primera vez que se visita la ruta"""
+    module_name, class_name, _ = ROUTES[route]
+    if module_name not in sys.modules:
+        module = importlib.import_module(module_name)
+        mark_startup(f"import {module_name}")
+    else:
+        module = sys.modules[module_name]
+    return getattr(module, class_name)
+
+
+# Rutas cuyas vistas se reutilizan entre navegaciones (los formularios se crean siempre)
+CACHED_ROUTES = {
+    "/dashboard",
+    "/realizar_venta",
+    "/ver_productos",
+    "/ver_proveedores",
+    "/ver_compradores",
+    "/ver_ventas",
+}
 
 
 def main(page: Page):
@@ -27,56 +103,115 @@ def main(page: Page):
     # page.window_height = 800
     page.window_maximized = True
     page.padding = 0
-    
+
+    # Vistas de listado reutilizables entre navegaciones: ruta -> (vista, sesión)
+    view_cache = OrderedDict()
+    # Sesiones de las vistas no cacheables montadas actualmente
+    view_sessions = []
+    startup_reported = []
+
+    def close_view_sessions():
+        """Cierra las sesiones de las vistas que se desmontan"""
+        while view_sessions:
+            view_sessions.pop().close()
+
+    def clear_view_cache():
+        """Descarta las vistas en caché y cierra sus sesiones"""
+        while view_cache:
+            _, (_, session) = view_cache.popitem(last=False)
+            session.close()
+
+    def release_cached_sessions():
+        """
+        Cierra las sesiones de las vistas en caché: liberan su conexión y sus
+        objetos, y al volver a usarse abren una transacción nueva
+        """
+        for _, session in view_cache.values():
+            session.close()
+
+    def cache_view(route, view, session):
+        """Guarda la vista en caché, descartando la usada hace más tiempo"""
+        view_cache[route] = (view, session)
+        while len(view_cache) > VIEW_CACHE_SIZE:
+            _, (_, evicted_session) = view_cache.popitem(last=False)
+            evicted_session.close()
+
+    def create_view(route, session):
+        """Crea la vista correspondiente a la ruta"""
+        if route not in ROUTES:
+            return None
+        view_class = load_view_class(route)
+        return view_class(page, session, **ROUTES[route][2])
+
+    def verify_access_token(token):
+        # Importación diferida: jose solo se carga al validar el primer token
+        from services.authService import AuthService
+        return AuthService.verify_access_token(token)
 
     def route_change(route):
+        # Las consultas de este cliente se atribuyen a la nueva ruta
+        page.session.set(NAVIGATION_SESSION_KEY, query_stats.start_navigation(page.route))
         page.views.clear()
+        close_view_sessions()
+        release_cached_sessions()
 
         # Verificar autenticación
         token = page.client_storage.get("token")
         public_routes = ["/login", "/register", "/reset-password"]
 
-        if not token and page.route not in public_routes:
+        if page.route not in public_routes and not verify_access_token(token):
+            if token:
+                page.client_storage.remove("token")
+                page.client_storage.remove("user_role")
             page.go("/login")
             return
 
-        # Crear vista según la ruta
-        view = None
-        if page.route == "/login":
-            view = LoginView(page, session)
-        # elif page.route == "/register":
-        #    view = RegisterView(page, session)
-        # elif page.route == "/reset-password":
-        #    view = ResetPasswordView(page, session)
-        elif page.route == "/dashboard":
-            view = DashboardView(page, session)
-        elif page.route == "/realizar_venta":
-            view = MakeSaleView(page, session)
-        elif page.route == "/ver_productos":
-            view = PageProduct(page, session)
-        elif page.route == "/agregar_productos":
-            view = PageProductForm(page, session)
-        elif page.route == "/ver_proveedores":
-            view = PageSupplier(page, session)
-        elif page.route == "/agregar_proveedor":
-            view = PageSupplierForm(page, session, edit_mode=False)
-        elif page.route == "/editar_proveedor":
-            view = PageSupplierForm(page, session, edit_mode=True)
-        elif page.route == "/ver_compradores":
-            view = PageCustomer(page, session)
-        elif page.route == "/agregar_comprador":
-            view = PageCustomerForm(page, session, edit_mode=False)
-        elif page.route == "/editar_comprador":
-            view = PageCustomerForm(page, session, edit_mode=True)
-        elif page.route == "/ver_ventas":
-            view = SeeSalesView(page, session)
+        # Las vistas en caché pertenecen al usuario que inició sesión
+        if page.route in public_routes:
+            clear_view_cache()
+
+        cached = page.route in view_cache
+        if cached:
+            # Reutilizar la vista; se refresca una vez montada
+            view_cache.move_to_end(page.route)
+            view, _ = view_cache[page.route]
+        else:
+            # Cada vista trabaja con su propia sesión, que se cierra junto con ella
+            session = SessionLocal()
+            view = create_view(page.route, session)
+            if view is None:
+                session.close()
+            elif page.route in CACHED_ROUTES:
+                cache_view(page.route, view, session)
+            else:
+                view_sessions.append(session)
 
         # Actualizar la página
         if view:
             page.views.append(view)
         page.update()
 
+        # Consultar solo los datos desactualizados, ya con los controles en la página
+        if cached:
+            view.refresh()
+
+        # Advertir si la navegación ejecutó demasiadas consultas (posible N+1)
+        queries = query_stats.navigation_queries()
+        if queries > ROUTE_QUERY_WARNING:
+            logging.warning(f"La ruta {page.route} ejecutó {queries} consultas al navegar")
+
+        # Informar el perfil de arranque una sola vez, al mostrar la primera vista
+        if PROFILE_STARTUP and not startup_reported:
+            startup_reported.append(True)
+            mark_startup("primera vista")
+            report_startup()
+
+    def handle_disconnect(e):
+        close_view_sessions()
+        clear_view_cache()
+
     page.on_route_change = route_change
+    page.on_disconnect = handle_disconnect
     page.go("/login")
 
 
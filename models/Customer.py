@@ -1,7 +1,18 @@
-from sqlalchemy import Column, Integer, String, DateTime
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, DateTime, Index, func
+from sqlalchemy.orm import relationship, validates
 from database.connection import Base
 from datetime import datetime
+import unicodedata
+
+
+def search_key(text: str) -> str:
+    """
+    Normaliza un texto para buscarlo sin distinguir mayúsculas ni acentos.
+    lower() de SQLite solo convierte letras ASCII: 'Ángel' no coincidiría con 'án'.
+    """
+    decomposed = unicodedata.normalize('NFKD', text or '')
+    return ''.join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
 
 class Customer(Base):
     """
@@ -11,6 +22,7 @@ class Customer(Base):
         id (int): Identificador único del cliente
         name (str): Nombre del cliente
         email (str): Correo electrónico del cliente (único)
+        name_key (str): Nombre normalizado con search_key, para la búsqueda por prefijo
         created_at (datetime): Fecha de registro del cliente
         
     Relaciones:
@@ -26,11 +38,26 @@ class Customer(Base):
     id = Column(Integer, primary_key=True)
     name = Column(String, nullable=False)
     email = Column(String, unique=True, nullable=False)
+    name_key = Column(String)
     created_at = Column(DateTime, default=datetime.utcnow)
     
     # Relaciones
     commercial_invoice = relationship('CommercialInvoice', back_populates='customer')
     sales = relationship('Sale', back_populates='customer', cascade="all, delete-orphan")
+    
+    # Índices de la búsqueda por prefijo de search_customers (name_key y
+    # lower(email)) y del orden por nombre o email del listado; ninguno
+    # sirve a ILIKE '%texto%'
+    __table_args__ = (
+        Index('ix_customer_name_lower', func.lower(name)),
+        Index('ix_customer_email_lower', func.lower(email)),
+        Index('ix_customer_name_key', name_key),
+    )
+
+    @validates('name')
+    def _update_name_key(self, key, name):
+        self.name_key = search_key(name)
+        return name
 
     def __repr__(self):
         return f"Cliente(nombre={self.name})"
\ No newline at end of file
@@ -0,0 +1,41 @@
+from sqlalchemy import Column, Integer, Float, Date, String, UniqueConstraint
+from database.connection import Base
+
+# employee_id de las ventas sin empleado. Las columnas de la clave no admiten
+# NULL: la restricción única no considera iguales dos NULL
+NO_EMPLOYEE = 0
+
+class DailySalesSummary(Base):
+    """
+    Modelo que representa el resumen diario de ventas.
+    
+    Atributos:
+        id (int): Identificador único del resumen
+        date (date): Día de las ventas
+        payment_method (str): Método de pago
+        employee_id (int): Empleado que realizó las ventas (NO_EMPLOYEE si no hay)
+        sale_count (int): Cantidad de ventas registradas
+        gross_amount (float): Total bruto vendido
+        cancelled_amount (float): Total de ventas canceladas
+        item_count (int): Cantidad de unidades vendidas
+        
+    Se mantiene de forma incremental desde SaleService y puede
+    reconstruirse con scripts/rebuild_sales_summary.py
+    """
+    __tablename__ = 'daily_sales_summary'
+    
+    id = Column(Integer, primary_key=True)
+    date = Column(Date, nullable=False)
+    payment_method = Column(String, nullable=False)
+    employee_id = Column(Integer, nullable=False, default=NO_EMPLOYEE, server_default='0')
+    sale_count = Column(Integer, nullable=False, default=0)
+    gross_amount = Column(Float, nullable=False, default=0.0)
+    cancelled_amount = Column(Float, nullable=False, default=0.0)
+    item_count = Column(Integer, nullable=False, default=0)
+    
+    __table_args__ = (
+        UniqueConstraint('date', 'payment_method', 'employee_id', name='uq_daily_sales_summary_key'),
+    )
+    
+    def __repr__(self):
+        return f"Resumen(fecha={self.date}, metodo={self.payment_method}, total=${self.gross_amount:.2f})"
@@ -1,6 +1,9 @@
-from sqlalchemy import Column, Integer, String, Float, CheckConstraint
+from sqlalchemy import Column, Integer, String, Float, CheckConstraint, Index, text
 from database.connection import Base
 
+# Umbral usado para considerar un producto con stock bajo
+LOW_STOCK_THRESHOLD = 10
+
 class Product(Base):
     """
     Modelo que representa un producto en el sistema.
@@ -26,6 +29,12 @@ class Product(Base):
     __table_args__ = (
         CheckConstraint('price > 0', name='check_price_positive'),
         CheckConstraint('stock >= 0', name='check_stock_non_negative'),
+        # Índices (la búsqueda por nombre usa el índice de texto completo)
+        Index(
+            'ix_product_low_stock', 'stock',
+            sqlite_where=text(f'stock < {LOW_STOCK_THRESHOLD}'),
+            postgresql_where=text(f'stock < {LOW_STOCK_THRESHOLD}')
+        ),
     )
     
     def __repr__(self):
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey, String, CheckConstraint
+from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey, String, CheckConstraint, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from database.connection import Base
@@ -35,6 +35,8 @@ class Sale(Base):
             "payment_method IN ('efectivo', 'tarjeta', 'transferencia')", 
             name='check_valid_payment_method'
         ),
+        # Índices: (date, status) también sirve a los filtros solo por fecha
+        Index('ix_sales_date_status', 'date', 'status'),
     )
     
     def __repr__(self):
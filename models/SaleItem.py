@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Float, ForeignKey
+from sqlalchemy import Column, Integer, Float, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from database.connection import Base
 
@@ -17,5 +17,11 @@ class SaleItem(Base):
     product_id = Column(Integer, ForeignKey('product.id'))
     product = relationship('Product')
     
+    # Índices
+    __table_args__ = (
+        Index('ix_sale_items_sale_id', 'sale_id'),
+        Index('ix_sale_items_product_id', 'product_id'),
+    )
+    
     def __repr__(self):
         return f"Item de Venta(producto_id={self.product_id}, cantidad={self.quantity})"
\ No newline at end of file
@@ -2,6 +2,7 @@ from sqlalchemy import Column, Integer, String, Boolean, DateTime, Enum
 from sqlalchemy.orm import relationship
 from database.connection import Base
 import bcrypt
+from config.settings import BCRYPT_ROUNDS
 from datetime import datetime
 import enum
 
@@ -32,7 +33,7 @@ class User(Base):
     def set_password(self, password: str):
         """Establece el hash de la contraseña usando bcrypt"""
         password_bytes = password.encode('utf-8')
-        salt = bcrypt.gensalt()
+        salt = bcrypt.gensalt(rounds=BCRYPT_ROUNDS)
         self.password_hash = bcrypt.hashpw(password_bytes, salt).decode('utf-8')
     
     def check_password(self, password: str) -> bool:
@@ -41,6 +42,14 @@ class User(Base):
         hash_bytes = self.password_hash.encode('utf-8')
         return bcrypt.checkpw(password_bytes, hash_bytes)
     
+    def needs_rehash(self) -> bool:
+        """Indica si el hash fue generado con un costo distinto al configurado"""
+        try:
+            # Formato: $2b$<costo>$<salt+hash>
+            return int(self.password_hash.split('$')[2]) != BCRYPT_ROUNDS
+        except (AttributeError, IndexError, ValueError):
+            return True
+    
     def update_last_login(self):
         """Actualiza la fecha del último inicio de sesión"""
         self.last_login = datetime.utcnow()
\ No newline at end of file
@@ -5,4 +5,5 @@ from .Administrator import Administrator
 from .Employee import Employee
 from .Product import Product
 from .Stock import Stock
-from .Supplier import Supplier
\ No newline at end of file
+from .Supplier import Supplier
+from .DailySalesSummary import DailySalesSummary
\ No newline at end of file
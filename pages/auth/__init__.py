@@ -1,5 +1,18 @@
-from .login import LoginView
-from .register import RegisterView
-from .reset_password import ResetPasswordView
+import importlib
 
-__all__ = ['LoginView', 'RegisterView', 'ResetPasswordView']
\ No newline at end of file
+# Importación diferida: /login es la primera vista y sus páginas hermanas
+# cargan AuthService (jose, smtplib, bcrypt) al importarse
+_VIEWS = {
+    'LoginView': '.login',
+    'RegisterView': '.register',
+    'ResetPasswordView': '.reset_password',
+}
+
+
+def __getattr__(name):
+    if name in _VIEWS:
+        return getattr(importlib.import_module(_VIEWS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = ['LoginView', 'RegisterView', 'ResetPasswordView']
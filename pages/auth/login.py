@@ -1,5 +1,7 @@
+import contextvars
+import importlib
+import threading
 import flet as ft
-from services.authService import AuthService
 from ui.components.alerts import show_error_message, show_success_message
 
 
@@ -7,9 +9,17 @@ class LoginView(ft.View):
     def __init__(self, page: ft.Page, session):
         super().__init__()
         self.page = page
-        self.auth_service = AuthService(session)
+        self.session = session
         self.build_ui()
 
+    def did_mount(self):
+        # AuthService (jose, bcrypt) se importa después de mostrar la vista,
+        # en segundo plano, para que esté listo al iniciar sesión
+        threading.Thread(
+            target=importlib.import_module, args=("services.authService",),
+            name="load-auth", daemon=True
+        ).start()
+
     def build_ui(self):
         # Input fields
         self.username_field = ft.TextField(
@@ -41,6 +51,7 @@ class LoginView(ft.View):
             color=ft.colors.BLUE_GREY_900,
             elevation=3,
         )
+        self.login_progress = ft.ProgressRing(width=20, height=20, visible=False)
 
         # Card container for login form
         login_card = ft.Card(
@@ -56,6 +67,7 @@ class LoginView(ft.View):
                         self.username_field,
                         self.password_field,
                         self.login_button,
+                        self.login_progress,
                     ],
                     horizontal_alignment=ft.CrossAxisAlignment.CENTER,
                     spacing=15,
@@ -78,23 +90,51 @@ class LoginView(ft.View):
         ]
 
     def handle_login(self, e):
-        try:
-            if not all([self.username_field.value, self.password_field.value]):
-                show_error_message(self.page, "Todos los campos son obligatorios")
-                return
+        if not all([self.username_field.value, self.password_field.value]):
+            show_error_message(self.page, "Todos los campos son obligatorios")
+            return
 
-            user = self.auth_service.authenticate_user(
-                self.username_field.value, self.password_field.value
-            )
+        # bcrypt tarda: se espera en otro hilo para no bloquear el manejador
+        self.set_loading(True)
+        context = contextvars.copy_context()
+        threading.Thread(
+            target=context.run,
+            args=(
+                self.authenticate,
+                self.username_field.value,
+                self.password_field.value,
+                getattr(self.page, "client_ip", None),
+            ),
+            name="login",
+            daemon=True,
+        ).start()
+
+    def authenticate(self, username, password, client_ip):
+        from services.authService import AuthService, LoginThrottledError
+        try:
+            auth_service = AuthService(self.session)
+            user = auth_service.authenticate_user(username, password, client_ip=client_ip)
 
             if user:
-                token = self.auth_service.create_access_token(user)
+                token = auth_service.create_access_token(user)
                 self.page.client_storage.set("token", token)
                 self.page.client_storage.set("user_role", user.role.value)
                 show_success_message(self.page, "Inicio de sesión exitoso")
                 self.page.go("/dashboard")
-            else:
-                show_error_message(self.page, "Credenciales inválidas")
+                return
 
+            self.set_loading(False)
+            show_error_message(self.page, "Credenciales inválidas")
+
+        except LoginThrottledError as e:
+            self.set_loading(False)
+            show_error_message(self.page, str(e))
         except Exception as e:
+            self.set_loading(False)
             show_error_message(self.page, f"Error al iniciar sesión: {str(e)}")
+
+    def set_loading(self, loading: bool):
+        """Deshabilita el botón y muestra el progreso mientras se autentica"""
+        self.login_button.disabled = loading
+        self.login_progress.visible = loading
+        self.update()
@@ -1,21 +1,27 @@
 import flet as ft
-import csv
-from io import StringIO
 from sqlalchemy.orm import Session
 from services.customerService import CustomerService
 from ui.components.alerts import show_error_message, show_success_message
 from ui.components.navigation import create_navigation_rail, get_route_for_index
+from ui.components.debounced_search import DebouncedSearch
+from ui.components.pager import KeysetPager
+from ui.components.export_button import ExportButton
+from services.pagination import NEXT
+from database.connection import session_scope
+from services.changeTracker import change_tracker
 
 
 class PageCustomer(ft.View):
+    # Índice de columna de la tabla -> columna de orden del servicio
+    SORT_KEYS = {0: "id", 1: "name", 2: "email"}
+
     def __init__(self, page: ft.Page, session: Session):
         super().__init__(route="/ver_compradores", controls=[], padding=0)
         self.page = page
         self.session = session
         self.page.title = "Lista de Compradores"
         self.customer_service = CustomerService(session)
-        self.all_customers = []
-        self.current_page = 1
+        self.search_term = None
         self.customers_per_page = 10
         self.sort_column = None
         self.sort_reverse = False
@@ -27,6 +33,12 @@ class PageCustomer(ft.View):
             self.navigation_rail = create_navigation_rail(3, self.handle_navigation)
 
             # Campo de búsqueda
+            self.customer_search = DebouncedSearch(
+                self.search_customers,
+                self.show_filtered_customers,
+                on_error=lambda ex: show_error_message(
+                    self.page, f"Error al buscar clientes: {str(ex)}")
+            )
             self.search_field = ft.TextField(
                 label="Buscar cliente",
                 width=300,
@@ -34,25 +46,14 @@ class PageCustomer(ft.View):
                 on_change=self.filter_customers
             )
 
-            # Botón de exportar a CSV
-            self.export_button = ft.IconButton(
-                icon=ft.icons.DOWNLOAD,
-                tooltip="Exportar a CSV",
-                on_click=self.export_to_csv
-            )
+            # Botón de exportar a CSV (archivo en disco, en segundo plano)
+            self.export_button = ExportButton("customers", "clientes")
 
             # Controles de paginación
-            self.prev_button = ft.IconButton(
-                icon=ft.icons.ARROW_BACK,
-                tooltip="Página anterior",
-                on_click=self.prev_page
+            self.pager = KeysetPager(
+                lambda cursor, direction: self.fetch_customers(cursor, direction, self.search_term),
+                self.update_table
             )
-            self.next_button = ft.IconButton(
-                icon=ft.icons.ARROW_FORWARD,
-                tooltip="Página siguiente",
-                on_click=self.next_page
-            )
-            self.page_info = ft.Text(f"Páginas: {self.current_page}")
 
             # Barra de progreso
             self.progress_bar = ft.ProgressBar(visible=False)
@@ -87,11 +88,7 @@ class PageCustomer(ft.View):
                 self.add_button,
                 ft.Divider(height=20), 
                 self.customer_table,
-                ft.Row([
-                    self.prev_button,
-                    self.page_info,
-                    self.next_button
-                ], alignment=ft.MainAxisAlignment.CENTER)
+                self.pager
             ], spacing=20)
 
             # Configuración principal de controles sin scroll
@@ -122,33 +119,32 @@ class PageCustomer(ft.View):
             show_error_message(self.page, f"Error de navegación: {str(e)}")
 
     def filter_customers(self, e):
-        """Filtrar clientes según el texto de búsqueda"""
-        search_term = self.search_field.value.lower()
-        filtered = [
-            customer for customer in self.all_customers
-            if search_term in customer.name.lower() or search_term in customer.email.lower()
-        ]
-        self.update_table(filtered)
-        self.update()
-
-    def export_to_csv(self, e):
-        """Exportar la lista de clientes a un archivo CSV"""
-        try:
-            output = StringIO()
-            writer = csv.writer(output)
-            writer.writerow(["ID", "Nombre", "Email"])
-            for customer in self.all_customers:
-                writer.writerow([customer.id, customer.name, customer.email])
-            csv_data = output.getvalue()
-            # Codificar datos CSV para URL
-            csv_url = f"data:text/csv;charset=utf-8,{csv_data}"
-            self.page.launch_url(csv_url)
-            show_success_message(self.page, "Clientes exportados exitosamente.")
-        except Exception as e:
-            show_error_message(self.page, f"Error al exportar clientes: {str(e)}")
+        """Programar el filtrado de clientes según el texto de búsqueda"""
+        self.customer_search.trigger(self.search_field.value)
+
+    def search_customers(self, search_term):
+        """Buscar la primera página de clientes que coinciden (fuera del hilo de la UI)"""
+        self.search_term = (search_term or "").strip() or None
+        return self.fetch_customers(None, NEXT, self.search_term)
+
+    def show_filtered_customers(self, customers_page):
+        """Mostrar el resultado de la búsqueda más reciente"""
+        self.pager.show_first(customers_page)
+
+    def fetch_customers(self, cursor, direction, search=None):
+        """Obtener una página de clientes en una sesión propia"""
+        sort_by = self.SORT_KEYS.get(self.sort_column, "id")
+        with session_scope() as db:
+            return CustomerService(db).get_customers_listing_page(
+                cursor, direction, self.customers_per_page, search,
+                sort_by=sort_by, descending=self.sort_reverse)
+
+    def will_unmount(self):
+        """Cancelar búsquedas pendientes al salir de la vista"""
+        self.customer_search.cancel()
 
     def sort_customers(self, e):
-        """Ordenar clientes según la columna clicada"""
+        """Ordenar clientes en la base de datos según la columna clicada"""
         column = e.column_index
         if self.sort_column == column:
             self.sort_reverse = not self.sort_reverse
@@ -156,48 +152,16 @@ class PageCustomer(ft.View):
             self.sort_column = column
             self.sort_reverse = False
 
-        if column == 0:  # ID
-            self.all_customers.sort(key=lambda c: c.id, reverse=self.sort_reverse)
-        elif column == 1:  # Nombre
-            self.all_customers.sort(key=lambda c: c.name.lower(), reverse=self.sort_reverse)
-        elif column == 2:  # Email
-            self.all_customers.sort(key=lambda c: c.email.lower(), reverse=self.sort_reverse)
-
-        self.update_table(self.get_paginated_customers())
-
-    def prev_page(self, e):
-        """Ir a la página anterior"""
-        if self.current_page > 1:
-            self.current_page -= 1
-            self.update_pagination()
-
-    def next_page(self, e):
-        """Ir a la página siguiente"""
-        total_pages = (len(self.all_customers) + self.customers_per_page - 1) // self.customers_per_page
-        if self.current_page < total_pages:
-            self.current_page += 1
-            self.update_pagination()
-
-    def update_pagination(self):
-        """Actualizar la tabla basada en la página actual"""
-        paginated = self.get_paginated_customers()
-        self.update_table(paginated)
-        total_pages = (len(self.all_customers) + self.customers_per_page - 1) // self.customers_per_page
-        self.page_info.value = f"Páginas: {self.current_page} de {total_pages}"
-        self.page_info.update()
-
-    def get_paginated_customers(self):
-        """Obtener clientes para la página actual"""
-        start = (self.current_page - 1) * self.customers_per_page
-        end = start + self.customers_per_page
-        return self.all_customers[start:end]
+        self.pager.load_first()
 
     def update_table(self, customers):
         """Actualizar la tabla de clientes con la lista proporcionada"""
         self.customer_table.rows.clear()
         for customer in customers:
             self.add_customer_to_table(customer)
-        self.customer_table.update()
+        self.customer_table.sort_column_index = self.sort_column
+        self.customer_table.sort_ascending = not self.sort_reverse
+        self.update()
 
     def add_customer_to_table(self, customer):
         """Método auxiliar para agregar un cliente a la tabla"""
@@ -230,6 +194,12 @@ class PageCustomer(ft.View):
             )
         )
 
+    def refresh(self):
+        """Vuelve a consultar la página actual solo si los clientes cambiaron"""
+        if change_tracker.is_stale(self.data_versions):
+            self.data_versions = change_tracker.snapshot('customer')
+            self.pager.reload()
+
     def view_customer(self, customer):
         """Ver información detallada de un cliente"""
         try:
@@ -289,7 +259,7 @@ class PageCustomer(ft.View):
         try:
             self.customer_service.delete_customer(customer.id)
             show_success_message(self.page, "Cliente eliminado exitosamente.")
-            self.load_customers()
+            self.pager.reload()
             self.close_dialog()
         except Exception as e:
             show_error_message(self.page, f"Error al eliminar el cliente: {str(e)}")
@@ -305,9 +275,8 @@ class PageCustomer(ft.View):
             self.progress_bar.visible = True
             self.update()
 
-            self.all_customers = self.customer_service.get_all_customers()
-            self.current_page = 1
-            self.update_pagination()
+            self.data_versions = change_tracker.snapshot('customer')
+            self.pager.load_first()
         except Exception as e:
             show_error_message(self.page, f"Error al cargar los clientes: {str(e)}")
         finally:
@@ -66,4 +66,4 @@ class DashboardContent:
         return self.sale_service.get_total_sales_amount(today, today)
 
     def _get_low_stock_count(self):
-        return len([p for p in self.product_service.get_all_products() if p.stock < 10])
\ No newline at end of file
+        return self.product_service.count_low_stock_products()
\ No newline at end of file
@@ -4,6 +4,8 @@ from services.saleService import SaleService
 from services.productService import ProductService
 from ui.components.navigation import create_navigation_rail, get_route_for_index
 from .stats import create_stats_row
+from services.authService import AuthService
+from services.changeTracker import change_tracker
 from ui.components.alerts import show_error_message
 
 
@@ -21,6 +23,7 @@ class DashboardView(ft.View):
         self.build_ui()
 
     def build_ui(self):
+        self.data_versions = change_tracker.snapshot('sale', 'product')
         try:
             # Create navigation rail with proper constraints
             self.navigation_rail = create_navigation_rail(
@@ -130,6 +133,13 @@ class DashboardView(ft.View):
                 padding=20
             )
 
+    def refresh(self):
+        """Reconstruye las estadísticas solo si cambiaron ventas o productos"""
+        if change_tracker.is_stale(self.data_versions):
+            self.build_ui()
+            # build_ui solo reemplaza los controles: hay que enviarlos al cliente
+            self.update()
+
     def handle_navigation(self, e):
         try:
             route = get_route_for_index(e.control.selected_index)
@@ -139,6 +149,7 @@ class DashboardView(ft.View):
 
     def handle_logout(self, e):
         try:
+            AuthService.revoke_token(self.page.client_storage.get("token"))
             self.page.client_storage.remove("token")
             self.page.client_storage.remove("user_role")
             self.page.go("/login")
@@ -7,7 +7,7 @@ from ui.components.stats_card import StatsCard
 def create_stats_row(sale_service: SaleService, product_service: ProductService):
     today = datetime.now().date()
     today_sales = sale_service.get_total_sales_amount(today, today)
-    low_stock_count = len([p for p in product_service.get_all_products() if p.stock < 10])
+    low_stock_count = product_service.count_low_stock_products()
     
     return ft.Row([
         StatsCard(
@@ -3,6 +3,7 @@ from ..components.navigation_container import create_navigation_container
 from ..components.content_area import create_content_area
 from ..components.error_boundary import create_error_boundary
 from ..layouts.responsive_layout import create_responsive_layout
+from services.authService import AuthService
 from ui.components.alerts import show_error_message
 
 class DashboardView(ft.View):
@@ -87,6 +88,7 @@ class DashboardView(ft.View):
             return
             
         try:
+            AuthService.revoke_token(self.page.client_storage.get("token"))
             self.page.client_storage.remove("token")
             self.page.client_storage.remove("user_role")
             self.page.go("/login")
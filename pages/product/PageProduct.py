@@ -1,8 +1,12 @@
 import flet as ft
 from sqlalchemy.orm import Session
+from database.connection import session_scope
 from services.productService import ProductService
 from ui.components.alerts import show_error_message
 from ui.components.navigation import create_navigation_rail, get_route_for_index
+from ui.components.pager import KeysetPager
+from ui.components.export_button import ExportButton
+from services.changeTracker import change_tracker
 
 class PageProduct(ft.View):
     def __init__(self, page: ft.Page, session: Session):
@@ -33,6 +37,13 @@ class PageProduct(ft.View):
             on_click=lambda e: self.page.go("/agregar_productos")
         )
 
+        self.export_button = ExportButton("products", "productos")
+
+        self.pager = KeysetPager(
+            self.fetch_products,
+            self.show_products
+        )
+
         self.controls = [
                 ft.Container(
                     content=ft.Row([
@@ -42,10 +53,11 @@ class PageProduct(ft.View):
                             content=ft.Column([
                                 ft.Text("Productos", size=20, weight=ft.FontWeight.BOLD),
                                 ft.Container(
-                                    content=self.add_button,
+                                    content=ft.Row([self.add_button, self.export_button]),
                                     margin=ft.margin.only(top=10, bottom=20),  # Ajuste del espaciado
                                 ),
                                 self.product_table,
+                                self.pager,
                             ], spacing=20)  # Espaciado uniforme entre elementos
                         )
                     ]),
@@ -57,40 +69,54 @@ class PageProduct(ft.View):
 
     def load_products(self):
         try:
-            products = self.product_service.get_all_products()
-            self.product_table.rows.clear()
-            for product in products:
-                self.product_table.rows.append(
-                    ft.DataRow(
-                        cells=[
-                            ft.DataCell(ft.Text(str(product.id))),
-                            ft.DataCell(ft.Text(product.name)),
-                            ft.DataCell(ft.Text(f"${product.price:.2f}")),
-                            ft.DataCell(ft.Text(str(product.stock))),
-                            ft.DataCell(
-                                ft.Row([
-                                    ft.IconButton(
-                                        icon=ft.icons.EDIT,
-                                        tooltip="Editar",
-                                        on_click=lambda e, p=product: self.edit_product(
-                                            p)
-                                    ),
-                                    ft.IconButton(
-                                        icon=ft.icons.DELETE,
-                                        tooltip="Eliminar",
-                                        on_click=lambda e, p=product: self.delete_product(
-                                            p)
-                                    ),
-                                ])
-                            ),
-                        ]
-                    )
-                )
-            self.update()
+            self.data_versions = change_tracker.snapshot('product')
+            self.pager.load_first()
         except Exception as e:
             show_error_message(
                 self.page, f"Error al cargar los productos: {str(e)}")
 
+    def show_products(self, products):
+        self.product_table.rows.clear()
+        for product in products:
+            self.product_table.rows.append(
+                ft.DataRow(
+                    cells=[
+                        ft.DataCell(ft.Text(str(product.id))),
+                        ft.DataCell(ft.Text(product.name)),
+                        ft.DataCell(ft.Text(f"${product.price:.2f}")),
+                        ft.DataCell(ft.Text(str(product.stock))),
+                        ft.DataCell(
+                            ft.Row([
+                                ft.IconButton(
+                                    icon=ft.icons.EDIT,
+                                    tooltip="Editar",
+                                    on_click=lambda e, p=product: self.edit_product(
+                                        p)
+                                ),
+                                ft.IconButton(
+                                    icon=ft.icons.DELETE,
+                                    tooltip="Eliminar",
+                                    on_click=lambda e, p=product: self.delete_product(
+                                        p)
+                                ),
+                            ])
+                        ),
+                    ]
+                )
+            )
+        self.update()
+
+    def fetch_products(self, cursor, direction):
+        """Obtener una página de productos en una sesión propia"""
+        with session_scope() as db:
+            return ProductService(db).get_products_listing_page(cursor, direction)
+
+    def refresh(self):
+        """Vuelve a consultar la página actual solo si los productos cambiaron"""
+        if change_tracker.is_stale(self.data_versions):
+            self.data_versions = change_tracker.snapshot('product')
+            self.pager.reload()
+
     def edit_product(self, product):
         try:
             self.page.client_storage.set("edit_product_id", product.id)
@@ -102,7 +128,7 @@ class PageProduct(ft.View):
     def delete_product(self, product):
         try:
             self.product_service.delete_product(product.id)
-            self.load_products()
+            self.pager.reload()
         except Exception as e:
             show_error_message(
                 self.page, f"Error al eliminar el producto: {str(e)}")
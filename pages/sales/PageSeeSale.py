@@ -2,9 +2,13 @@ import logging
 import flet as ft
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
+from database.connection import session_scope
 from services.saleService import SaleService
 from ui.components.alerts import show_error_message
 from ui.components.navigation import create_navigation_rail, get_route_for_index
+from ui.components.pager import KeysetPager
+from ui.components.export_button import ExportButton
+from services.changeTracker import change_tracker
 
 class SeeSalesView(ft.View):
     def __init__(self, page: ft.Page, session: Session):
@@ -36,6 +40,14 @@ class SeeSalesView(ft.View):
             on_click=self.load_sales
         )
 
+        # Export sale line items for the selected range
+        self.export_button = ExportButton(
+            "sale_items",
+            "ventas",
+            tooltip="Exportar líneas de venta",
+            get_params=self.export_params
+        )
+
         # Sales table
         self.sales_table = ft.DataTable(
             columns=[
@@ -49,6 +61,12 @@ class SeeSalesView(ft.View):
             rows=[]
         )
 
+        # Pagination
+        self.pager = KeysetPager(
+            self.fetch_sales,
+            self.show_sales
+        )
+
         # Layout
         self.controls = [
             ft.Container(
@@ -63,9 +81,11 @@ class SeeSalesView(ft.View):
                             ft.Row([
                                 self.date_from,
                                 self.date_to,
-                                self.filter_button
+                                self.filter_button,
+                                self.export_button
                             ], spacing=10),
-                            self.sales_table
+                            self.sales_table,
+                            self.pager
                         ], spacing=20),
                         expand=True
                     )
@@ -77,33 +97,52 @@ class SeeSalesView(ft.View):
         # Load initial sales
         self.load_sales()
 
+    def export_params(self):
+        """Rango de fechas ingresado para exportar las líneas de venta"""
+        from_date = datetime.strptime(self.date_from.value, "%Y-%m-%d")
+        to_date = datetime.strptime(self.date_to.value, "%Y-%m-%d") + timedelta(days=1)
+        return {"from_date": from_date, "to_date": to_date}
+
     def load_sales(self, e=None):
         try:
-            from_date = datetime.strptime(self.date_from.value, "%Y-%m-%d")
-            to_date = datetime.strptime(self.date_to.value, "%Y-%m-%d") + timedelta(days=1)
-            
-            sales = self.sale_service.get_sales_between_dates(from_date, to_date)
-            
-            self.sales_table.rows.clear()
+            self.from_date = datetime.strptime(self.date_from.value, "%Y-%m-%d")
+            self.to_date = datetime.strptime(self.date_to.value, "%Y-%m-%d") + timedelta(days=1)
             
-            for sale in sales:
-                self.sales_table.rows.append(
-                    ft.DataRow(cells=[
-                        ft.DataCell(ft.Text(str(sale.id))),
-                        ft.DataCell(ft.Text(sale.date.strftime("%Y-%m-%d %H:%M"))),
-                        ft.DataCell(ft.Text(sale.customer.name if sale.customer else "N/A")),
-                        ft.DataCell(ft.Text(sale.payment_method)),
-                        ft.DataCell(ft.Text(f"${sale.total_amount:.2f}")),
-                        ft.DataCell(ft.Text(sale.status))
-                    ])
-                )
-            
-            self.sales_table.update()
+            self.data_versions = change_tracker.snapshot('sale')
+            self.pager.load_first()
             
         except Exception as e:
             logging.error(f"Error loading sales: {str(e)}")
             show_error_message(self.page, f"Error al cargar las ventas: {str(e)}")
 
+    def show_sales(self, sales):
+        self.sales_table.rows.clear()
+        
+        for sale in sales:
+            self.sales_table.rows.append(
+                ft.DataRow(cells=[
+                    ft.DataCell(ft.Text(str(sale.id))),
+                    ft.DataCell(ft.Text(sale.date.strftime("%Y-%m-%d %H:%M"))),
+                    ft.DataCell(ft.Text(sale.customer_name or "N/A")),
+                    ft.DataCell(ft.Text(sale.payment_method)),
+                    ft.DataCell(ft.Text(f"${sale.total_amount:.2f}")),
+                    ft.DataCell(ft.Text(sale.status))
+                ])
+            )
+        
+        self.update()
+
+    def fetch_sales(self, cursor, direction):
+        """Obtener una página de ventas en una sesión propia"""
+        with session_scope() as db:
+            return SaleService(db).get_sales_page(self.from_date, self.to_date, cursor, direction)
+
+    def refresh(self):
+        """Vuelve a consultar la página actual solo si hubo ventas nuevas o canceladas"""
+        if change_tracker.is_stale(self.data_versions):
+            self.data_versions = change_tracker.snapshot('sale')
+            self.pager.reload()
+
     def handle_navigation(self, e):
         try:
             route = get_route_for_index(e.control.selected_index)
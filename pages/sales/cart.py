@@ -0,0 +1,61 @@
+"""
+Modelo del carrito de venta
+"""
+from typing import Dict, List, Optional
+
+
+class Cart:
+    """
+    Carrito indexado por ID de producto con el total acumulado.
+
+    Agregar, modificar y eliminar líneas son operaciones O(1); el total
+    se ajusta con la diferencia de cada línea en lugar de recalcularse.
+    """
+
+    def __init__(self):
+        self._items: Dict[int, dict] = {}
+        self.total = 0.0
+
+    def set_quantity(self, product_id: int, name: str, price: float, quantity: int) -> dict:
+        """Agrega el producto o actualiza su cantidad y devuelve la línea"""
+        item = self._items.get(product_id)
+        if item is None:
+            item = {
+                "product_id": product_id,
+                "name": name,
+                "quantity": 0,
+                "price": price,
+                "total": 0.0
+            }
+            self._items[product_id] = item
+        line_total = item["price"] * quantity
+        self.total += line_total - item["total"]
+        item["quantity"] = quantity
+        item["total"] = line_total
+        return item
+
+    def remove(self, product_id: int) -> Optional[dict]:
+        """Elimina la línea del producto y la devuelve"""
+        item = self._items.pop(product_id, None)
+        if item is not None:
+            self.total -= item["total"]
+        if not self._items:
+            self.total = 0.0
+        return item
+
+    def get(self, product_id: int) -> Optional[dict]:
+        return self._items.get(product_id)
+
+    def items(self) -> List[dict]:
+        """Líneas del carrito en orden de carga"""
+        return list(self._items.values())
+
+    def clear(self):
+        self._items.clear()
+        self.total = 0.0
+
+    def __contains__(self, product_id: int) -> bool:
+        return product_id in self._items
+
+    def __len__(self) -> int:
+        return len(self._items)
@@ -4,6 +4,12 @@ from services.saleService import SaleService
 from services.customerService import CustomerService
 from ui.components.alerts import show_error_message, show_success_message
 from ui.components.navigation import create_navigation_rail, get_route_for_index
+from ui.components.debounced_search import DebouncedSearch
+from ui.components.type_ahead_picker import TypeAheadPicker
+from ui.components.virtual_list import VirtualList
+from .cart import Cart
+from services.changeTracker import change_tracker
+from database.connection import session_scope
 import logging
 
 
@@ -14,17 +20,20 @@ class MakeSaleView(ft.View):
         self.product_service = ProductService(session)
         self.sale_service = SaleService(session)
         self.customer_service = CustomerService(session)
-        self.cart = []
+        self.cart = Cart()
+        self.cart_rows = {}
         self.build_ui()
 
     def build_ui(self):
         self.navigation_rail = create_navigation_rail(
             1, self.handle_navigation)
 
-        self.customer_dropdown = ft.Dropdown(
-            label="Cliente",
+        self.customer_picker = TypeAheadPicker(
+            "Cliente",
+            self.query_customers,
             width=300,
-            options=self.get_customer_options()
+            on_error=lambda ex: show_error_message(
+                self.page, f"Error al buscar clientes: {str(ex)}")
         )
 
         self.payment_method_dropdown = ft.Dropdown(
@@ -37,6 +46,13 @@ class MakeSaleView(ft.View):
             ]
         )
 
+        self.product_search = DebouncedSearch(
+            self.query_products,
+            self.show_products,
+            on_error=lambda ex: show_error_message(
+                self.page, f"Error al buscar productos: {str(ex)}")
+        )
+
         self.search_name_input = ft.TextField(
             label="Buscar por Nombre",
             width=300,
@@ -49,16 +65,26 @@ class MakeSaleView(ft.View):
             on_change=self.search_products
         )
 
-        self.product_table = ft.DataTable(
-            columns=[
-                ft.DataColumn(label=ft.Text("ID")),
-                ft.DataColumn(label=ft.Text("Producto")),
-                ft.DataColumn(label=ft.Text("Precio")),
-                ft.DataColumn(label=ft.Text("Cantidad")),
-                ft.DataColumn(label=ft.Text("Agregar")),
-            ],
-            rows=self.get_initial_product_rows()
+        self.product_quantities = {}
+        self.product_list = VirtualList(
+            self.create_product_row,
+            self.bind_product_row,
+            row_height=56,
+            height=480,
+            width=520
         )
+        self.product_table = ft.Column([
+            ft.Row([
+                ft.Text("ID", width=50, weight=ft.FontWeight.BOLD),
+                ft.Text("Producto", width=180, weight=ft.FontWeight.BOLD),
+                ft.Text("Precio", width=80, weight=ft.FontWeight.BOLD),
+                ft.Text("Cantidad", width=100, weight=ft.FontWeight.BOLD),
+                ft.Text("Agregar", width=60, weight=ft.FontWeight.BOLD),
+            ]),
+            self.product_list
+        ])
+        self.data_versions = change_tracker.snapshot('product')
+        self.product_list.set_items(self.product_service.get_all_products())
 
         self.cart_table = ft.DataTable(
             columns=[
@@ -91,7 +117,7 @@ class MakeSaleView(ft.View):
                         content=ft.Column([
                             ft.Text("Realizar Venta", size=20,
                                     weight=ft.FontWeight.BOLD),
-                            self.customer_dropdown,
+                            self.customer_picker,
                             self.payment_method_dropdown,
                             ft.Row([
                                 self.search_name_input,
@@ -112,37 +138,41 @@ class MakeSaleView(ft.View):
 
     """ Costumers """
 
-    def get_customer_options(self):
-        customers = self.customer_service.get_all_customers()
-        return [ft.dropdown.Option(str(customer.id), customer.name) for customer in customers]
+    def query_customers(self, term):
+        """Obtiene las mejores coincidencias de clientes en una sesión propia"""
+        with session_scope() as db:
+            customers = CustomerService(db).search_customers(term, limit=10)
+            return [
+                (str(customer.id), f"{customer.name} ({customer.email})")
+                for customer in customers
+            ]
 
     """ Products table """
 
-    def get_initial_product_rows(self):
-        products = self.product_service.get_all_products()
-        self.product_quantities = {}
-        return self.get_product_rows(products)
-
-    def get_product_rows(self, products):
-        self.product_quantities = {}  # Reiniciar cantidades
-        return [
-            ft.DataRow(cells=[
-                ft.DataCell(ft.Text(str(pro.id))),
-                ft.DataCell(ft.Text(pro.name)),
-                ft.DataCell(ft.Text(f"${pro.price:.2f}")),
-                ft.DataCell(ft.TextField(
-                    label="Cantidad",
-                    width=100,
-                    on_change=lambda e, product_id=pro.id: self.update_quantity(
-                        product_id, e.control.value)
-                )),
-                ft.DataCell(ft.ElevatedButton(
-                    content=ft.Icon(ft.icons.ADD),
-                    on_click=lambda e, product_id=pro.id: self.add_product(
-                        product_id)
-                )),
-            ]) for pro in products
-        ]
+    def create_product_row(self):
+        """Crea una fila reutilizable de la lista de productos"""
+        row = ft.Row([
+            ft.Text(width=50),
+            ft.Text(width=180, no_wrap=True),
+            ft.Text(width=80),
+            ft.TextField(label="Cantidad", width=100),
+            ft.IconButton(icon=ft.icons.ADD, width=60),
+        ])
+        quantity_field, add_button = row.controls[3], row.controls[4]
+        quantity_field.on_change = lambda e, r=row: self.update_quantity(
+            r.data, e.control.value)
+        add_button.on_click = lambda e, r=row: self.add_product(r.data)
+        return row
+
+    def bind_product_row(self, row, product):
+        """Enlaza una fila reutilizable con los datos de un producto"""
+        row.data = product.id
+        id_text, name_text, price_text, quantity_field, _ = row.controls
+        id_text.value = str(product.id)
+        name_text.value = product.name
+        price_text.value = f"${product.price:.2f}"
+        quantity = self.product_quantities.get(product.id)
+        quantity_field.value = str(quantity) if quantity else ""
 
     def update_quantity(self, product_id, quantity):
         try:
@@ -152,21 +182,27 @@ class MakeSaleView(ft.View):
             self.product_quantities[product_id] = 0
 
     def search_products(self, e):
-        try:
-            name = self.search_name_input.value
-            category = self.search_category_input.value
-
+        self.product_search.trigger(
+            (self.search_name_input.value, self.search_category_input.value))
+
+    def query_products(self, terms):
+        """Consulta los productos en una sesión propia, fuera del hilo de la UI"""
+        name, category = terms
+        with session_scope() as db:
+            product_service = ProductService(db)
             if name:
-                products = self.product_service.get_products_by_name(name)
+                products = product_service.search_products(name)
             elif category:
-                products = self.product_service.get_products_by_category(
-                    category)
+                products = product_service.get_products_by_category(category)
             else:
-                products = self.product_service.get_all_products()
-
-            self.product_table.rows = self.get_product_rows(products)
-            self.product_table.update()
+                products = product_service.get_all_products()
+            db.expunge_all()
+            return products
 
+    def show_products(self, products):
+        try:
+            self.product_quantities = {}  # Reiniciar cantidades
+            self.product_list.set_items(products)
         except Exception as e:
             show_error_message(
                 self.page, f"Error al buscar productos: {str(e)}")
@@ -198,23 +234,12 @@ class MakeSaleView(ft.View):
                     self.page, "Stock insuficiente para el producto seleccionado.")
                 return
 
-            # Calcular total y actualizar o agregar al carrito
-            for item in self.cart:
-                if item["product_id"] == product_id:
-                    item["quantity"] = self.product_quantities[product_id]
-                    item["total"] = item["price"] * item["quantity"]
-                    break
-            else:
-                total = product.price * self.product_quantities[product_id]
-                self.cart.append({
-                    "product_id": product_id,
-                    "name": product.name,
-                    "quantity": self.product_quantities[product_id],
-                    "price": product.price,
-                    "total": total
-                })
-
-            self.update_cart_table()
+            # Actualizar o agregar la línea del carrito
+            self.cart.set_quantity(
+                product_id, product.name, product.price,
+                self.product_quantities[product_id])
+
+            self.render_cart_item(product_id)
             show_success_message(self.page, "Producto agregado al carrito.")
 
         except ValueError:
@@ -226,9 +251,12 @@ class MakeSaleView(ft.View):
 
     """ Cart table """
 
-    def update_cart_table(self):
-        self.cart_table.rows = [
-            ft.DataRow(cells=[
+    def render_cart_item(self, product_id):
+        """Actualiza solo la fila del producto modificado"""
+        item = self.cart.get(product_id)
+        row = self.cart_rows.get(product_id)
+        if row is None:
+            row = ft.DataRow(cells=[
                 ft.DataCell(ft.Text(str(item["product_id"]))),
                 ft.DataCell(ft.Text(item["name"])),
                 ft.DataCell(ft.Text(str(item["quantity"]))),
@@ -236,21 +264,44 @@ class MakeSaleView(ft.View):
                 ft.DataCell(ft.IconButton(
                     icon=ft.icons.DELETE,
                     tooltip="Eliminar",
-                    on_click=lambda e, p=item: self.delete_product_cart(
-                        p["product_id"])
+                    on_click=lambda e, p=product_id: self.delete_product_cart(p)
                 )),
                 ft.DataCell(ft.Text(f"${item['total']:.2f}"))
-            ]) for item in self.cart
-        ]
-        self.total_text.value = f"Total: ${
-            sum(item['total'] for item in self.cart):.2f}"
-        self.cart_table.update()
+            ])
+            self.cart_rows[product_id] = row
+            self.cart_table.rows.append(row)
+            self.cart_table.update()
+        else:
+            quantity_text, total_text = row.cells[2].content, row.cells[5].content
+            quantity_text.value = str(item["quantity"])
+            total_text.value = f"${item['total']:.2f}"
+            quantity_text.update()
+            total_text.update()
+        self.update_total()
+
+    def update_total(self):
+        self.total_text.value = f"Total: ${self.cart.total:.2f}"
         self.total_text.update()
 
+    def clear_cart_table(self):
+        self.cart.clear()
+        self.product_quantities = {}
+        self.cart_rows.clear()
+        self.cart_table.rows.clear()
+        self.cart_table.update()
+        self.update_total()
+        # La vista queda en caché: la próxima venta empieza sin cliente ni método de pago
+        self.customer_picker.clear()
+        self.payment_method_dropdown.value = None
+        self.payment_method_dropdown.update()
+
     def delete_product_cart(self, product_id):
-        self.cart = [
-            item for item in self.cart if item['product_id'] != product_id]
-        self.update_cart_table()
+        self.cart.remove(product_id)
+        row = self.cart_rows.pop(product_id, None)
+        if row is not None:
+            self.cart_table.rows.remove(row)
+            self.cart_table.update()
+        self.update_total()
         show_success_message(self.page, "Producto eliminado del carrito.")
 
     """ End sale """
@@ -261,7 +312,7 @@ class MakeSaleView(ft.View):
                 show_error_message(self.page, "El carrito está vacío.")
                 return
 
-            customer_id = self.customer_dropdown.value
+            customer_id = self.customer_picker.value
             payment_method = self.payment_method_dropdown.value.lower()
 
             if not customer_id or not payment_method:
@@ -279,15 +330,14 @@ class MakeSaleView(ft.View):
                 "customer_id": customer_id,
                 "employee_id": 1,
                 "payment_method": payment_method,
-                "items": self.cart,
-                "total": float(sum(item["total"] for item in self.cart))
+                "items": self.cart.items(),
+                "total": float(round(self.cart.total, 2))
             }
 
             result = self.sale_service.create_sale(sale_data)
             if result:
                 show_success_message(self.page, "Venta finalizada con éxito.")
-                self.cart.clear()
-                self.update_cart_table()
+                self.clear_cart_table()
                 self.page.go("/ver_ventas")
             else:
                 show_error_message(self.page, "Error al crear la venta")
@@ -297,6 +347,16 @@ class MakeSaleView(ft.View):
             show_error_message(
                 self.page, f"Error al finalizar la venta: {str(e)}")
 
+    def refresh(self):
+        """Vuelve a buscar productos solo si el catálogo o el stock cambiaron"""
+        if change_tracker.is_stale(self.data_versions):
+            self.data_versions = change_tracker.snapshot('product')
+            self.search_products(None)
+
+    def will_unmount(self):
+        self.product_search.cancel()
+        self.customer_picker.cancel()
+
     """ Navigation """
 
     def handle_navigation(self, e):
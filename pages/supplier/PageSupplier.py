@@ -1,8 +1,12 @@
 import flet as ft
 from sqlalchemy.orm import Session
+from database.connection import session_scope
 from services.supplierService import SupplierService
 from ui.components.alerts import show_error_message
 from ui.components.navigation import create_navigation_rail, get_route_for_index
+from ui.components.pager import KeysetPager
+from ui.components.export_button import ExportButton
+from services.changeTracker import change_tracker
 
 class PageSupplier(ft.View):
     def __init__(self, page: ft.Page, session: Session):
@@ -39,6 +43,15 @@ class PageSupplier(ft.View):
             expand=False,
         )
 
+        # Exportación a CSV
+        self.export_button = ExportButton("suppliers", "proveedores")
+
+        # Paginación de la tabla
+        self.pager = KeysetPager(
+            self.fetch_suppliers,
+            self.show_suppliers
+        )
+
         # Estructura principal de la vista
         self.controls = [
             ft.Container(
@@ -50,12 +63,13 @@ class PageSupplier(ft.View):
                         content=ft.Column([
                             ft.Text("Proveedores", size=20, weight=ft.FontWeight.BOLD),
                             ft.Row(
-                                controls=[self.add_button],
+                                controls=[self.add_button, self.export_button],
                                 alignment=ft.MainAxisAlignment.START,  # Alinear el botón al inicio
                                 spacing=20,
                             ),
                             ft.Divider(height=20),  # Separador entre el botón y la tabla
-                            self.supplier_table  # Tabla de proveedores
+                            self.supplier_table,  # Tabla de proveedores
+                            self.pager
                         ], spacing=20)
                     )
                 ]),
@@ -68,43 +82,57 @@ class PageSupplier(ft.View):
 
     def load_suppliers(self):
         try:
-            # Obtener lista de proveedores
-            suppliers = self.supplier_service.get_all_suppliers()
-            self.supplier_table.rows.clear()
-
-            # Agregar filas a la tabla con datos de los proveedores
-            for supplier in suppliers:
-                self.supplier_table.rows.append(
-                    ft.DataRow(
-                        cells=[
-                            ft.DataCell(ft.Text(str(supplier.id))),
-                            ft.DataCell(ft.Text(supplier.name)),
-                            ft.DataCell(ft.Text(supplier.email)),
-                            ft.DataCell(ft.Text(supplier.phone)),
-                            ft.DataCell(ft.Text(supplier.address)),
-                            ft.DataCell(
-                                ft.Row([
-                                    ft.IconButton(
-                                        icon=ft.icons.EDIT,
-                                        tooltip="Editar",
-                                        on_click=lambda e, s=supplier: self.edit_supplier(s)
-                                    ),
-                                    ft.IconButton(
-                                        icon=ft.icons.DELETE,
-                                        tooltip="Eliminar",
-                                        on_click=lambda e, s=supplier: self.delete_supplier(s)
-                                    ),
-                                ])
-                            ),
-                        ]
-                    )
-                )
-            self.supplier_table.update()  # Actualizar la tabla
+            # Obtener la primera página de proveedores
+            self.data_versions = change_tracker.snapshot('supplier')
+            self.pager.load_first()
         except Exception as e:
             show_error_message(
                 self.page, f"Error al cargar los proveedores: {str(e)}"
             )
 
+    def show_suppliers(self, suppliers):
+        self.supplier_table.rows.clear()
+
+        # Agregar filas a la tabla con datos de los proveedores
+        for supplier in suppliers:
+            self.supplier_table.rows.append(
+                ft.DataRow(
+                    cells=[
+                        ft.DataCell(ft.Text(str(supplier.id))),
+                        ft.DataCell(ft.Text(supplier.name)),
+                        ft.DataCell(ft.Text(supplier.email)),
+                        ft.DataCell(ft.Text(supplier.phone)),
+                        ft.DataCell(ft.Text(supplier.address)),
+                        ft.DataCell(
+                            ft.Row([
+                                ft.IconButton(
+                                    icon=ft.icons.EDIT,
+                                    tooltip="Editar",
+                                    on_click=lambda e, s=supplier: self.edit_supplier(s)
+                                ),
+                                ft.IconButton(
+                                    icon=ft.icons.DELETE,
+                                    tooltip="Eliminar",
+                                    on_click=lambda e, s=supplier: self.delete_supplier(s)
+                                ),
+                            ])
+                        ),
+                    ]
+                )
+            )
+        self.update()  # Actualizar la vista
+
+    def fetch_suppliers(self, cursor, direction):
+        """Obtener una página de proveedores en una sesión propia"""
+        with session_scope() as db:
+            return SupplierService(db).get_suppliers_listing_page(cursor, direction)
+
+    def refresh(self):
+        """Vuelve a consultar la página actual solo si los proveedores cambiaron"""
+        if change_tracker.is_stale(self.data_versions):
+            self.data_versions = change_tracker.snapshot('supplier')
+            self.pager.reload()
+
     def edit_supplier(self, supplier):
         try:
             self.page.client_storage.set("edit_supplier_id", supplier.id)
@@ -117,7 +145,7 @@ class PageSupplier(ft.View):
     def delete_supplier(self, supplier):
         try:
             self.supplier_service.delete_supplier(supplier.id)
-            self.load_suppliers()
+            self.pager.reload()
         except Exception as e:
             show_error_message(
                 self.page, f"Error al eliminar el proveedor: {str(e)}"
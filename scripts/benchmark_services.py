@@ -0,0 +1,466 @@
+"""
+Mide el tiempo de los métodos de los servicios sobre los datos de la base
+
+Uso:
+    DATABASE_URL=sqlite:///bench.db python scripts/seed_data.py --sales 50000
+    DATABASE_URL=sqlite:///bench.db python scripts/benchmark_services.py --save-baseline
+    DATABASE_URL=sqlite:///bench.db python scripts/benchmark_services.py --compare
+
+Los métodos de escritura crean y luego eliminan sus propios registros, pero las
+ventas creadas quedan canceladas: conviene usar una base de datos de prueba.
+Los resultados se emiten en JSON; con --compare el proceso termina con código 1
+si algún método es más lento que la línea base por encima de la tolerancia.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+# Agregar el directorio raíz al path de Python
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import func, select
+from config.settings import BASE_DIR
+from database.connection import init_db, SessionLocal
+from database.instrumentation import query_stats
+from models.User import User
+from models.Employee import Employee
+from models.Customer import Customer
+from models.Product import Product
+from models.Sale import Sale
+from services.productService import ProductService
+from services.customerService import CustomerService
+from services.saleService import SaleService
+from services.authService import AuthService
+from services.productCache import product_cache
+from services.tokenCache import token_cache
+from services.pagination import PREV
+
+DEFAULT_BASELINE = BASE_DIR / "benchmark_baseline.json"
+
+# Prefijo de los registros creados por el benchmark, para poder eliminarlos al final
+BENCH_PREFIX = "bench"
+
+# Métodos que no se miden y el motivo
+SKIPPED = {
+    "ProductService.delete_all_products": "destructivo: elimina el catálogo completo",
+    "SaleService.get_current_employee_id": "no implementado en el servicio",
+    "ProductService.get_products_by_category": "Product no tiene columna category",
+}
+
+
+class BenchmarkCase:
+    """Método a medir: setup prepara los argumentos de cada repetición (no se mide)"""
+
+    def __init__(self, name, run, setup=None, repeat=None):
+        self.name = name
+        self.run = run
+        self.setup = setup
+        self.repeat = repeat
+
+
+def load_context(db, password: str) -> dict:
+    """Obtiene de la base los valores de ejemplo que usan los casos"""
+    product = db.execute(
+        select(Product.id, Product.name).order_by(Product.id).limit(1)).first()
+    customer = db.execute(
+        select(Customer.id, Customer.email, Customer.name).order_by(Customer.id).limit(1)).first()
+    employee_id = db.scalar(select(Employee.id).order_by(Employee.id).limit(1))
+    sale_id = db.scalar(select(Sale.id).order_by(Sale.id).limit(1))
+    username = db.scalar(
+        select(User.username).join(Employee, Employee.id == User.id).order_by(User.id).limit(1))
+    # Productos con más stock para las ventas creadas por el benchmark
+    stocked = db.execute(
+        select(Product.id, Product.price).order_by(Product.stock.desc()).limit(2)).all()
+    latest = db.scalar(select(func.max(Sale.date))) or datetime.utcnow()
+
+    if not product or not customer or not employee_id or not username or not sale_id:
+        raise ValueError(
+            "La base no tiene datos suficientes; ejecute primero scripts/seed_data.py")
+
+    return {
+        "product_id": product.id,
+        # Primera palabra del nombre, como lo escribiría el usuario en el buscador
+        "product_term": product.name.split()[0].lower(),
+        "customer_id": customer.id,
+        "customer_email": customer.email,
+        "customer_prefix": customer.name[:3],
+        "employee_id": employee_id,
+        "sale_id": sale_id,
+        "username": username,
+        "password": password,
+        "sale_products": [tuple(row) for row in stocked],
+        "date_to": latest,
+        "date_from": latest - timedelta(days=30),
+        "created_sales": [],
+        "counter": 0,
+    }
+
+
+def unique_suffix(ctx: dict) -> str:
+    ctx["counter"] += 1
+    return f"{os.getpid()}_{ctx['counter']}"
+
+
+def product_cases(ctx: dict) -> list:
+    def warm_catalog(db):
+        ProductService(db).get_all_products()
+
+    def create_bench_product(db):
+        suffix = unique_suffix(ctx)
+        return ProductService(db).create_product(
+            {"name": f"{BENCH_PREFIX} producto {suffix}", "price": 1.0, "stock": 1}).id
+
+    return [
+        BenchmarkCase("ProductService.get_all_products[frío]",
+                      lambda db, _: ProductService(db).get_all_products(),
+                      setup=lambda db: product_cache.clear()),
+        BenchmarkCase("ProductService.get_all_products[caché]",
+                      lambda db, _: ProductService(db).get_all_products(),
+                      setup=warm_catalog),
+        BenchmarkCase("ProductService.iter_products",
+                      lambda db, _: sum(1 for _ in ProductService(db).iter_products())),
+        BenchmarkCase("ProductService.get_product_by_id[frío]",
+                      lambda db, _: ProductService(db).get_product_by_id(ctx["product_id"]),
+                      setup=lambda db: product_cache.clear()),
+        BenchmarkCase("ProductService.get_product_by_id[caché]",
+                      lambda db, _: ProductService(db).get_product_by_id(ctx["product_id"])),
+        BenchmarkCase("ProductService.get_products_page",
+                      lambda db, _: ProductService(db).get_products_page()),
+        BenchmarkCase("ProductService.get_products_page[anterior]",
+                      lambda db, _: ProductService(db).get_products_page(
+                          cursor=(ctx["product_id"] + 40, ctx["product_id"] + 40),
+                          direction=PREV)),
+        BenchmarkCase("ProductService.get_products_listing_page",
+                      lambda db, _: ProductService(db).get_products_listing_page()),
+        BenchmarkCase("ProductService.get_cache_stats",
+                      lambda db, _: ProductService(db).get_cache_stats()),
+        BenchmarkCase("ProductService.get_products_by_name",
+                      lambda db, _: ProductService(db).get_products_by_name(ctx["product_term"])),
+        BenchmarkCase("ProductService.search_products",
+                      lambda db, _: ProductService(db).search_products(ctx["product_term"])),
+        BenchmarkCase("ProductService.get_products_by_price_range",
+                      lambda db, _: ProductService(db).get_products_by_price_range(10, 50)),
+        BenchmarkCase("ProductService.count_products",
+                      lambda db, _: ProductService(db).count_products()),
+        BenchmarkCase("ProductService.count_low_stock_products",
+                      lambda db, _: ProductService(db).count_low_stock_products()),
+        BenchmarkCase("ProductService.create_product",
+                      lambda db, _: create_bench_product(db)),
+        BenchmarkCase("ProductService.update_product",
+                      lambda db, product_id: ProductService(db).update_product(
+                          product_id, {"price": 2.0}),
+                      setup=create_bench_product),
+        BenchmarkCase("ProductService.delete_product",
+                      lambda db, product_id: ProductService(db).delete_product(product_id),
+                      setup=create_bench_product),
+    ]
+
+
+def customer_cases(ctx: dict) -> list:
+    def bench_customer_data():
+        suffix = unique_suffix(ctx)
+        return {"name": f"{BENCH_PREFIX} cliente {suffix}",
+                "email": f"{BENCH_PREFIX}_{suffix}@example.com"}
+
+    def create_bench_customer(db):
+        return CustomerService(db).create_customer(bench_customer_data()).id
+
+    return [
+        BenchmarkCase("CustomerService.get_all_customers",
+                      lambda db, _: CustomerService(db).get_all_customers()),
+        BenchmarkCase("CustomerService.iter_customers",
+                      lambda db, _: sum(1 for _ in CustomerService(db).iter_customers())),
+        BenchmarkCase("CustomerService.get_customers_page",
+                      lambda db, _: CustomerService(db).get_customers_page()),
+        BenchmarkCase("CustomerService.get_customers_page[nombre]",
+                      lambda db, _: CustomerService(db).get_customers_page(sort_by="name")),
+        BenchmarkCase("CustomerService.get_customers_page[filtro]",
+                      lambda db, _: CustomerService(db).get_customers_page(
+                          search=ctx["customer_prefix"])),
+        BenchmarkCase("CustomerService.get_customers_listing_page",
+                      lambda db, _: CustomerService(db).get_customers_listing_page()),
+        BenchmarkCase("CustomerService.get_customers_listing_page[nombre]",
+                      lambda db, _: CustomerService(db).get_customers_listing_page(
+                          sort_by="name")),
+        BenchmarkCase("CustomerService.get_customer_by_id",
+                      lambda db, _: CustomerService(db).get_customer_by_id(ctx["customer_id"])),
+        BenchmarkCase("CustomerService.get_customer_by_email",
+                      lambda db, _: CustomerService(db).get_customer_by_email(
+                          ctx["customer_email"])),
+        BenchmarkCase("CustomerService.search_customers",
+                      lambda db, _: CustomerService(db).search_customers(ctx["customer_prefix"])),
+        BenchmarkCase("CustomerService.create_customer",
+                      lambda db, data: CustomerService(db).create_customer(data),
+                      setup=lambda db: bench_customer_data()),
+        BenchmarkCase("CustomerService.update_customer",
+                      lambda db, customer_id: CustomerService(db).update_customer(
+                          customer_id, {"name": f"{BENCH_PREFIX} cliente editado"}),
+                      setup=create_bench_customer),
+        BenchmarkCase("CustomerService.delete_customer",
+                      lambda db, customer_id: CustomerService(db).delete_customer(customer_id),
+                      setup=create_bench_customer),
+    ]
+
+
+def sale_cases(ctx: dict) -> list:
+    def sale_data():
+        return {
+            "customer_id": ctx["customer_id"],
+            "employee_id": ctx["employee_id"],
+            "payment_method": "efectivo",
+            "items": [
+                {"product_id": product_id, "quantity": 1, "price": price}
+                for product_id, price in ctx["sale_products"]
+            ],
+            "total": sum(price for _, price in ctx["sale_products"]),
+        }
+
+    def create_sale(db, data):
+        ctx["created_sales"].append(SaleService(db).create_sale(data).id)
+
+    def cancel_sale(db, sale_id):
+        SaleService(db).cancel_sale(sale_id)
+
+    date_from, date_to = ctx["date_from"], ctx["date_to"]
+    return [
+        BenchmarkCase("SaleService.create_sale", create_sale, setup=lambda db: sale_data()),
+        # Cancela las ventas creadas por el caso anterior, que restaura el stock
+        BenchmarkCase("SaleService.cancel_sale", cancel_sale,
+                      setup=lambda db: ctx["created_sales"].pop()),
+        BenchmarkCase("SaleService.get_sale_by_id",
+                      lambda db, _: SaleService(db).get_sale_by_id(ctx["sale_id"])),
+        BenchmarkCase("SaleService.get_sales_by_date_range",
+                      lambda db, _: SaleService(db).get_sales_by_date_range(date_from, date_to)),
+        BenchmarkCase("SaleService.get_total_sales_amount",
+                      lambda db, _: SaleService(db).get_total_sales_amount(date_from, date_to)),
+        BenchmarkCase("SaleService.get_sales_summary",
+                      lambda db, _: SaleService(db).get_sales_summary(date_from, date_to)),
+        BenchmarkCase("SaleService.get_sales_between_dates",
+                      lambda db, _: SaleService(db).get_sales_between_dates(date_from, date_to)),
+        BenchmarkCase("SaleService.get_sales_listing",
+                      lambda db, _: SaleService(db).get_sales_listing(date_from, date_to)),
+        BenchmarkCase("SaleService.get_sales_page",
+                      lambda db, _: SaleService(db).get_sales_page(date_from, date_to)),
+    ]
+
+
+def auth_cases(ctx: dict) -> list:
+    def new_token(db):
+        user = db.query(User).filter(User.username == ctx["username"]).one()
+        return AuthService(db).create_access_token(user)
+
+    def bench_user_data(db):
+        suffix = unique_suffix(ctx)
+        return {"username": f"{BENCH_PREFIX}_{suffix}",
+                "email": f"{BENCH_PREFIX}_{suffix}@example.com",
+                "password": ctx["password"]}
+
+    def uncached_token(db):
+        token = new_token(db)
+        token_cache.clear()
+        return token
+
+    def cached_token(db):
+        token = new_token(db)
+        AuthService.verify_access_token(token)
+        return token
+
+    return [
+        # bcrypt domina el tiempo: pocas repeticiones
+        BenchmarkCase("AuthService.authenticate_user",
+                      lambda db, _: AuthService(db).authenticate_user(
+                          ctx["username"], ctx["password"]),
+                      repeat=3),
+        BenchmarkCase("AuthService.create_access_token",
+                      lambda db, _: new_token(db)),
+        BenchmarkCase("AuthService.verify_access_token[frío]",
+                      lambda db, token: AuthService.verify_access_token(token),
+                      setup=uncached_token),
+        BenchmarkCase("AuthService.verify_access_token[caché]",
+                      lambda db, token: AuthService.verify_access_token(token),
+                      setup=cached_token),
+        BenchmarkCase("AuthService.revoke_token",
+                      lambda db, token: AuthService.revoke_token(token),
+                      setup=new_token),
+        BenchmarkCase("AuthService.register_user",
+                      lambda db, data: AuthService(db).register_user(data),
+                      setup=bench_user_data, repeat=3),
+    ]
+
+
+def run_case(case: BenchmarkCase, repeat: int) -> dict:
+    """Ejecuta un caso y devuelve sus tiempos en milisegundos"""
+    timings = []
+    queries = 0
+    db = SessionLocal()
+    try:
+        for _ in range(case.repeat or repeat):
+            argument = case.setup(db) if case.setup else None
+            queries_before = query_stats.total
+            start = time.perf_counter()
+            case.run(db, argument)
+            timings.append((time.perf_counter() - start) * 1000)
+            queries += query_stats.total - queries_before
+            db.rollback()
+    except Exception as e:
+        db.rollback()
+        return {"error": str(e)}
+    finally:
+        db.close()
+
+    return {
+        "repeat": len(timings),
+        "min_ms": round(min(timings), 3),
+        "median_ms": round(statistics.median(timings), 3),
+        "mean_ms": round(statistics.mean(timings), 3),
+        "max_ms": round(max(timings), 3),
+        # Consultas por llamada: un aumento suele indicar un N+1
+        "queries": round(queries / len(timings), 2),
+    }
+
+
+def cleanup(ctx: dict):
+    """Elimina los registros creados por el benchmark"""
+    db = SessionLocal()
+    try:
+        product_service = ProductService(db)
+        for product_id in db.scalars(
+            select(Product.id).where(Product.name.like(f"{BENCH_PREFIX} producto %"))
+        ).all():
+            product_service.delete_product(product_id)
+        customer_service = CustomerService(db)
+        for customer_id in db.scalars(
+            select(Customer.id).where(Customer.name.like(f"{BENCH_PREFIX} cliente%"))
+        ).all():
+            customer_service.delete_customer(customer_id)
+        user_ids = db.scalars(
+            select(User.id).where(User.username.like(f"{BENCH_PREFIX}\\_%", escape="\\"))
+        ).all()
+        if user_ids:
+            db.query(Employee).filter(Employee.id.in_(user_ids)).delete(synchronize_session=False)
+            db.query(User).filter(User.id.in_(user_ids)).delete(synchronize_session=False)
+            db.commit()
+    finally:
+        db.close()
+
+
+def dataset_size(db) -> dict:
+    """Cantidad de filas de las tablas principales"""
+    return {
+        model.__tablename__: db.scalar(select(func.count(model.id)))
+        for model in (User, Customer, Product, Sale)
+    }
+
+
+def run_benchmarks(repeat: int = 20, password: str = "password123", only=None) -> dict:
+    """Ejecuta todos los casos y devuelve el reporte"""
+    init_db()
+    db = SessionLocal()
+    try:
+        ctx = load_context(db, password)
+        dataset = dataset_size(db)
+        dialect = db.get_bind().dialect.name
+    finally:
+        db.close()
+
+    cases = product_cases(ctx) + customer_cases(ctx) + sale_cases(ctx) + auth_cases(ctx)
+    results = {}
+    try:
+        for case in cases:
+            if only and not any(pattern in case.name for pattern in only):
+                continue
+            results[case.name] = run_case(case, repeat)
+    finally:
+        # Cancelar las ventas que hayan quedado sin cancelar y eliminar los datos creados
+        while ctx["created_sales"]:
+            run_case(BenchmarkCase("cancel", lambda db, sale_id: SaleService(db).cancel_sale(
+                sale_id), setup=lambda db: ctx["created_sales"].pop()), 1)
+        cleanup(ctx)
+
+    return {
+        "generated_at": datetime.utcnow().isoformat(timespec="seconds"),
+        "database": dialect,
+        "dataset": dataset,
+        "repeat": repeat,
+        "skipped": SKIPPED,
+        "results": results,
+    }
+
+
+def compare(report: dict, baseline: dict, tolerance: float, min_delta_ms: float) -> list:
+    """Compara las medianas con la línea base y devuelve las regresiones (incluye los errores)"""
+    regressions = []
+    for name, result in report["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if not base or "median_ms" not in base:
+            continue
+        # Un método con línea base que ahora falla también es una regresión
+        if "error" in result:
+            regressions.append(name)
+            continue
+        ratio = result["median_ms"] / base["median_ms"] if base["median_ms"] else 1.0
+        result["baseline_median_ms"] = base["median_ms"]
+        result["ratio"] = round(ratio, 3)
+        # Se ignoran diferencias absolutas menores al ruido de medición
+        if ratio > 1 + tolerance and result["median_ms"] - base["median_ms"] > min_delta_ms:
+            regressions.append(name)
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de los servicios")
+    parser.add_argument("--repeat", type=int, default=20,
+                        help="Repeticiones por método")
+    parser.add_argument("--password", default="password123",
+                        help="Contraseña de los usuarios generados por seed_data.py")
+    parser.add_argument("--only", nargs="*",
+                        help="Medir solo los métodos cuyo nombre contenga estos textos")
+    parser.add_argument("--output", help="Archivo donde guardar el reporte JSON")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE),
+                        help="Archivo de la línea base")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Guarda el reporte como nueva línea base")
+    parser.add_argument("--compare", action="store_true",
+                        help="Compara con la línea base y falla si hay regresiones")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Aumento relativo permitido de la mediana (0.25 = 25%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0,
+                        help="Diferencia absoluta mínima para considerar una regresión")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    report = run_benchmarks(repeat=args.repeat, password=args.password, only=args.only)
+
+    regressions = []
+    if args.compare:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.tolerance, args.min_delta_ms)
+        report["regressions"] = regressions
+
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    else:
+        print(output)
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            f.write(output)
+        print(f"Línea base guardada en {args.baseline}", file=sys.stderr)
+
+    if regressions:
+        print(f"Regresiones: {', '.join(regressions)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
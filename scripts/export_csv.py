@@ -0,0 +1,63 @@
+"""
+Exporta clientes, productos, proveedores o líneas de venta a un archivo CSV
+
+Uso:
+    python scripts/export_csv.py customers
+    python scripts/export_csv.py sale_items --from 2024-01-01 --to 2024-12-31 --output ventas.csv
+"""
+import argparse
+import os
+import sys
+from datetime import datetime, timedelta
+
+# Agregar el directorio raíz al path de Python
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.connection import init_db, session_scope
+from services.exportService import ExportService, default_export_path
+
+EXPORTS = ["customers", "products", "suppliers", "sale_items"]
+
+
+def print_progress(written: int, total: int):
+    print(f"\r{written}/{total} filas", end="", flush=True)
+
+
+def export_csv(export: str, output=None, from_date=None, to_date=None):
+    """Ejecuta la exportación indicada y devuelve (ruta, filas escritas)"""
+    init_db()
+    path = output or default_export_path(export)
+    params = {}
+    if export == "sale_items":
+        params = {"from_date": from_date, "to_date": to_date}
+    with session_scope() as db:
+        export_fn = getattr(ExportService(db), f"export_{export}")
+        written = export_fn(path, progress=print_progress, **params)
+    print()
+    return path, written
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Exporta una tabla a CSV")
+    parser.add_argument("export", choices=EXPORTS)
+    parser.add_argument("--output", help="Archivo de salida (por defecto en EXPORT_DIR)")
+    parser.add_argument("--from", dest="from_date", default="1970-01-01",
+                        help="Fecha inicial de las ventas (AAAA-MM-DD)")
+    parser.add_argument("--to", dest="to_date", default=datetime.now().strftime("%Y-%m-%d"),
+                        help="Fecha final de las ventas, inclusive (AAAA-MM-DD)")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    try:
+        path, written = export_csv(
+            args.export,
+            output=args.output,
+            from_date=datetime.strptime(args.from_date, "%Y-%m-%d"),
+            to_date=datetime.strptime(args.to_date, "%Y-%m-%d") + timedelta(days=1),
+        )
+        print(f"{written} filas exportadas a {path}")
+    except Exception as e:
+        print(f"Error al exportar: {str(e)}")
+        raise
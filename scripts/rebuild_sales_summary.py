@@ -0,0 +1,27 @@
+import os
+import sys
+
+# Agregar el directorio raíz al path de Python
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.connection import init_db, SessionLocal
+from services.salesSummaryService import SalesSummaryService
+
+def rebuild_sales_summary():
+    """Reconstruye la tabla daily_sales_summary desde las ventas existentes"""
+    try:
+        init_db()
+        
+        db = SessionLocal()
+        rows = SalesSummaryService(db).rebuild()
+        print(f"Resumen diario reconstruido: {rows} filas")
+        
+    except Exception as e:
+        print(f"Error al reconstruir el resumen: {str(e)}")
+        raise
+    finally:
+        if 'db' in locals():
+            db.close()
+
+if __name__ == "__main__":
+    rebuild_sales_summary()
@@ -0,0 +1,326 @@
+"""
+Genera datos sintéticos para probar la aplicación con volúmenes realistas
+
+Uso:
+    python scripts/seed_data.py --customers 5000 --products 2000 --sales 50000
+
+La base de datos se toma de DATABASE_URL; conviene usar una copia, por ejemplo:
+    DATABASE_URL=sqlite:///bench.db python scripts/seed_data.py
+"""
+import argparse
+import os
+import random
+import sys
+from datetime import datetime, timedelta
+
+# Agregar el directorio raíz al path de Python
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import bcrypt
+from sqlalchemy import func, insert, select, text
+from config.settings import BCRYPT_ROUNDS
+from database.connection import init_db, SessionLocal
+from database.search import create_product_search_index
+from models.User import User, UserRole
+from models.Employee import Employee
+from models.Customer import Customer, search_key
+from models.Product import Product
+from models.Supplier import Supplier
+from models.Sale import Sale
+from models.SaleItem import SaleItem
+from services.salesSummaryService import SalesSummaryService
+
+FIRST_NAMES = [
+    "Ana", "Juan", "María", "Carlos", "Lucía", "Pedro", "Sofía", "Diego", "Valentina",
+    "Martín", "Camila", "Jorge", "Florencia", "Luis", "Paula", "Andrés", "Julieta",
+    "Federico", "Agustina", "Pablo", "Romina", "Gabriel", "Carolina", "Tomás",
+]
+LAST_NAMES = [
+    "García", "Rodríguez", "González", "Fernández", "López", "Martínez", "Pérez",
+    "Gómez", "Sánchez", "Romero", "Díaz", "Álvarez", "Torres", "Ruiz", "Ramírez",
+    "Flores", "Acosta", "Benítez", "Medina", "Herrera", "Suárez", "Castro",
+]
+PRODUCT_TYPES = [
+    "Filtro de aceite", "Pastillas de freno", "Bujía", "Correa de distribución",
+    "Amortiguador", "Batería", "Lámpara", "Escobilla", "Radiador", "Bomba de agua",
+    "Sensor de oxígeno", "Embrague", "Disco de freno", "Filtro de aire", "Termostato",
+    "Rótula", "Alternador", "Motor de arranque", "Junta de culata", "Manguera",
+]
+PRODUCT_BRANDS = [
+    "Bosch", "NGK", "Valeo", "Mahle", "SKF", "Gates", "Monroe", "Ferodo", "Denso",
+    "Philips", "Osram", "Sachs", "Fram", "Moura", "Hella",
+]
+PRODUCT_VARIANTS = ["estándar", "reforzado", "premium", "económico", "alto rendimiento"]
+STREETS = [
+    "San Martín", "Belgrano", "Rivadavia", "Mitre", "Sarmiento", "Moreno", "Italia",
+    "España", "Córdoba", "Santa Fe", "Corrientes", "Alvear", "Urquiza", "Colón",
+]
+SUPPLIER_KINDS = ["Distribuidora", "Repuestos", "Importadora", "Mayorista", "Autopartes"]
+
+# Métodos de pago y su frecuencia relativa
+PAYMENT_METHODS = ["efectivo", "tarjeta", "transferencia"]
+PAYMENT_WEIGHTS = [0.5, 0.35, 0.15]
+
+# Distribución horaria de las ventas (más ventas a media mañana y a la tarde)
+SALE_HOURS = list(range(8, 21))
+SALE_HOUR_WEIGHTS = [2, 5, 8, 9, 7, 4, 3, 5, 7, 8, 7, 4, 2]
+
+
+def zipf_weights(count: int, exponent: float = 1.0) -> list:
+    """Pesos de popularidad: pocos elementos concentran la mayoría de las elecciones"""
+    return [1 / (rank ** exponent) for rank in range(1, count + 1)]
+
+
+def next_id(db, model) -> int:
+    """Primer ID libre de la tabla, para poder ejecutar el script varias veces"""
+    return (db.scalar(select(func.max(model.id))) or 0) + 1
+
+
+def insert_in_batches(db, model, rows, batch_size: int) -> int:
+    """Inserta las filas por lotes y confirma cada lote"""
+    batch = []
+    count = 0
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            db.execute(insert(model), batch)
+            db.commit()
+            count += len(batch)
+            batch = []
+    if batch:
+        db.execute(insert(model), batch)
+        db.commit()
+        count += len(batch)
+    return count
+
+
+def person_name(rng: random.Random) -> str:
+    return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+
+def generate_customers(rng, start_id: int, count: int, days: int):
+    now = datetime.utcnow()
+    for customer_id in range(start_id, start_id + count):
+        name = person_name(rng)
+        first, last = name.lower().split(" ", 1)
+        yield {
+            "id": customer_id,
+            "name": name,
+            "name_key": search_key(name),
+            "email": f"{first}.{last.replace(' ', '')}{customer_id}@example.com",
+            "created_at": now - timedelta(days=rng.uniform(0, days * 2)),
+        }
+
+
+def generate_products(rng, start_id: int, count: int):
+    for product_id in range(start_id, start_id + count):
+        # Precios con distribución log-normal: muchos baratos, pocos caros
+        price = round(max(0.5, rng.lognormvariate(3.5, 1.0)), 2)
+        # Aproximadamente un 10% de los productos con stock bajo
+        if rng.random() < 0.1:
+            stock = rng.randint(0, 9)
+        else:
+            stock = int(rng.paretovariate(1.5) * 20)
+        yield {
+            "id": product_id,
+            "name": (
+                f"{rng.choice(PRODUCT_TYPES)} {rng.choice(PRODUCT_BRANDS)} "
+                f"{rng.choice(PRODUCT_VARIANTS)} {product_id}"
+            ),
+            "price": price,
+            "stock": stock,
+        }
+
+
+def generate_suppliers(rng, start_id: int, count: int):
+    for supplier_id in range(start_id, start_id + count):
+        last_name = rng.choice(LAST_NAMES)
+        yield {
+            "id": supplier_id,
+            "name": f"{rng.choice(SUPPLIER_KINDS)} {last_name} {supplier_id}",
+            "phone": f"+54 11 {rng.randint(4000, 6999)}-{rng.randint(1000, 9999)}",
+            "email": f"ventas{supplier_id}@{last_name.lower()}.example.com",
+            "address": f"{rng.choice(STREETS)} {rng.randint(1, 5000)}, local {supplier_id}",
+            "description": f"Proveedor de {rng.choice(PRODUCT_TYPES).lower()}",
+        }
+
+
+def generate_users(rng, start_id: int, count: int, password_hash: str):
+    now = datetime.utcnow()
+    for user_id in range(start_id, start_id + count):
+        yield {
+            "id": user_id,
+            "username": f"usuario{user_id}",
+            "email": f"usuario{user_id}@example.com",
+            "password_hash": password_hash,
+            # Uno de cada diez usuarios es encargado
+            "role": UserRole.MANAGER if user_id % 10 == 0 else UserRole.EMPLOYEE,
+            "is_active": True,
+            "created_at": now,
+        }
+
+
+def generate_sales(rng, start_id: int, start_item_id: int, count: int, days: int,
+                   max_items: int, customer_ids: list, products: list, employee_ids: list):
+    """Genera ventas con sus líneas; devuelve tuplas (venta, [líneas])"""
+    customer_weights = zipf_weights(len(customer_ids), 0.8)
+    product_weights = zipf_weights(len(products))
+    today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    item_id = start_item_id
+
+    for sale_id in range(start_id, start_id + count):
+        day = today - timedelta(days=int(rng.triangular(0, days, 0)))
+        # Los fines de semana se vende menos
+        if day.weekday() >= 5 and rng.random() < 0.4:
+            day -= timedelta(days=2)
+        date = day.replace(
+            hour=rng.choices(SALE_HOURS, SALE_HOUR_WEIGHTS)[0],
+            minute=rng.randint(0, 59),
+            second=rng.randint(0, 59)
+        )
+
+        # Cantidad de líneas con distribución geométrica: la mayoría de 1 a 3
+        item_count = 1
+        while item_count < max_items and rng.random() < 0.45:
+            item_count += 1
+        chosen = {}
+        for product_id, price in rng.choices(products, product_weights, k=item_count):
+            chosen[product_id] = price
+
+        items = []
+        for product_id, price in chosen.items():
+            quantity = rng.choices([1, 2, 3, 4, 6, 10], [60, 20, 8, 5, 4, 3])[0]
+            items.append({
+                "id": item_id,
+                "sale_id": sale_id,
+                "product_id": product_id,
+                "quantity": quantity,
+                "unit_price": price,
+                "subtotal": round(quantity * price, 2),
+            })
+            item_id += 1
+
+        sale = {
+            "id": sale_id,
+            "date": date,
+            "total_amount": round(sum(item["subtotal"] for item in items), 2),
+            "payment_method": rng.choices(PAYMENT_METHODS, PAYMENT_WEIGHTS)[0],
+            "status": "cancelled" if rng.random() < 0.05 else "completed",
+            "customer_id": rng.choices(customer_ids, customer_weights)[0],
+            "employee_id": rng.choice(employee_ids) if employee_ids else None,
+        }
+        yield sale, items
+
+
+def sync_sequences(db):
+    """Ajusta las secuencias de PostgreSQL después de insertar IDs explícitos"""
+    if db.get_bind().dialect.name != "postgresql":
+        return
+    for model in (User, Customer, Product, Supplier, Sale, SaleItem):
+        table = model.__tablename__
+        db.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+            f"COALESCE((SELECT MAX(id) FROM {table}), 1))"
+        ))
+    db.commit()
+
+
+def seed(customers: int = 1000, products: int = 500, suppliers: int = 50, users: int = 10,
+         sales: int = 5000, max_items: int = 8, days: int = 365, password: str = "password123",
+         batch_size: int = 1000, seed_value: int = 42) -> dict:
+    """Inserta los volúmenes pedidos y devuelve la cantidad de filas creadas"""
+    rng = random.Random(seed_value)
+    init_db()
+    db = SessionLocal()
+    created = {}
+    try:
+        # Todos los usuarios generados comparten la contraseña: se calcula el hash una vez
+        password_hash = bcrypt.hashpw(
+            password.encode('utf-8'), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode('utf-8')
+        start = next_id(db, User)
+        created["users"] = insert_in_batches(
+            db, User, generate_users(rng, start, users, password_hash), batch_size)
+        insert_in_batches(
+            db, Employee, ({"id": user_id} for user_id in range(start, start + users)), batch_size)
+
+        created["customers"] = insert_in_batches(
+            db, Customer, generate_customers(rng, next_id(db, Customer), customers, days),
+            batch_size)
+        created["products"] = insert_in_batches(
+            db, Product, generate_products(rng, next_id(db, Product), products), batch_size)
+        created["suppliers"] = insert_in_batches(
+            db, Supplier, generate_suppliers(rng, next_id(db, Supplier), suppliers), batch_size)
+
+        customer_ids = list(db.scalars(select(Customer.id)))
+        product_rows = [tuple(row) for row in db.execute(select(Product.id, Product.price))]
+        employee_ids = list(db.scalars(select(Employee.id)))
+        if sales and (not customer_ids or not product_rows):
+            raise ValueError("Se necesitan clientes y productos para generar ventas")
+
+        created["sales"] = 0
+        created["sale_items"] = 0
+        sale_batch, item_batch = [], []
+        for sale, items in generate_sales(
+            rng, next_id(db, Sale), next_id(db, SaleItem), sales, days, max_items,
+            customer_ids, product_rows, employee_ids
+        ):
+            sale_batch.append(sale)
+            item_batch.extend(items)
+            if len(sale_batch) >= batch_size:
+                created["sales"] += insert_in_batches(db, Sale, sale_batch, batch_size)
+                created["sale_items"] += insert_in_batches(db, SaleItem, item_batch, batch_size)
+                sale_batch, item_batch = [], []
+        if sale_batch:
+            created["sales"] += insert_in_batches(db, Sale, sale_batch, batch_size)
+            created["sale_items"] += insert_in_batches(db, SaleItem, item_batch, batch_size)
+
+        sync_sequences(db)
+
+        # Reconstruir los datos derivados: índice de búsqueda y resumen diario
+        create_product_search_index(db.connection())
+        db.commit()
+        SalesSummaryService(db).rebuild()
+        return created
+    finally:
+        db.close()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Genera datos sintéticos de prueba")
+    parser.add_argument("--customers", type=int, default=1000)
+    parser.add_argument("--products", type=int, default=500)
+    parser.add_argument("--suppliers", type=int, default=50)
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--sales", type=int, default=5000)
+    parser.add_argument("--max-items", type=int, default=8,
+                        help="Máximo de líneas por venta")
+    parser.add_argument("--days", type=int, default=365,
+                        help="Cantidad de días hacia atrás en los que se reparten las ventas")
+    parser.add_argument("--password", default="password123",
+                        help="Contraseña de los usuarios generados")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=42,
+                        help="Semilla del generador aleatorio (resultados reproducibles)")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    try:
+        created = seed(
+            customers=args.customers,
+            products=args.products,
+            suppliers=args.suppliers,
+            users=args.users,
+            sales=args.sales,
+            max_items=args.max_items,
+            days=args.days,
+            password=args.password,
+            batch_size=args.batch_size,
+            seed_value=args.seed,
+        )
+        for table, count in created.items():
+            print(f"{table}: {count} filas")
+    except Exception as e:
+        print(f"Error al generar los datos: {str(e)}")
+        raise
@@ -1,29 +1,84 @@
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional
+import bcrypt
 from sqlalchemy.orm import Session
+from database.instrumentation import track_queries
 from models.User import User, UserRole
 from models.Employee import Employee
 from models.Administrator import Administrator
 from jose import JWTError, jwt
 from config.settings import (
-    SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES,
+    SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES, AUTH_WORKERS, BCRYPT_ROUNDS,
     EMAIL_HOST, EMAIL_PORT, EMAIL_HOST_USER, EMAIL_HOST_PASSWORD
 )
+from concurrent.futures import ThreadPoolExecutor
+from .loginThrottle import login_throttle
+from .tokenCache import token_cache
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 
+# Pool acotado para las operaciones de bcrypt, fuera de los manejadores de la UI
+_password_pool = ThreadPoolExecutor(max_workers=AUTH_WORKERS, thread_name_prefix="bcrypt")
+
+
+@lru_cache(maxsize=1)
+def _dummy_password_hash() -> bytes:
+    """Hash fijo, con el costo configurado, para verificar usuarios inexistentes"""
+    return bcrypt.hashpw(b"usuario-inexistente", bcrypt.gensalt(rounds=BCRYPT_ROUNDS))
+
+
+def _check_dummy_password(password: str) -> bool:
+    return bcrypt.checkpw(password.encode('utf-8'), _dummy_password_hash())
+
+
+# Generar el hash fijo de antemano para que el primer intento tampoco se distinga
+_password_pool.submit(_dummy_password_hash)
+
+
+class LoginThrottledError(Exception):
+    """Se lanza cuando el usuario o la IP superaron los intentos permitidos"""
+
+    def __init__(self, retry_after: int):
+        super().__init__(
+            f"Demasiados intentos fallidos. Intente nuevamente en {retry_after} segundos")
+        self.retry_after = retry_after
+
+
+@track_queries
 class AuthService:
     def __init__(self, db: Session):
         self.db = db
     
-    def authenticate_user(self, username: str, password: str) -> Optional[User]:
-        """Autentica un usuario por username/password"""
+    def authenticate_user(self, username: str, password: str, client_ip: Optional[str] = None) -> Optional[User]:
+        """
+        Autentica un usuario por username/password. Espera a bcrypt: la UI
+        debe llamarlo fuera de sus manejadores de eventos.
+        """
+        throttle_keys = [f"user:{username.lower()}"]
+        if client_ip:
+            throttle_keys.append(f"ip:{client_ip}")
+
+        retry_after = login_throttle.retry_after(throttle_keys)
+        if retry_after:
+            raise LoginThrottledError(retry_after)
+
         user = self.db.query(User).filter(User.username == username).first()
-        if user and user.check_password(password):
+        if user is None:
+            # Verificar igual contra un hash fijo: el tiempo de respuesta no revela
+            # si el usuario existe
+            _password_pool.submit(_check_dummy_password, password).result()
+        elif _password_pool.submit(user.check_password, password).result():
+            login_throttle.reset(throttle_keys)
+            if user.needs_rehash():
+                # Actualizar el hash al costo configurado
+                _password_pool.submit(user.set_password, password).result()
             user.update_last_login()
             self.db.commit()
             return user
+
+        login_throttle.record_failure(throttle_keys)
         return None
     
     def create_access_token(self, user: User) -> str:
@@ -39,6 +94,32 @@ class AuthService:
         }
         return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     
+    @staticmethod
+    def verify_access_token(token: Optional[str]) -> Optional[dict]:
+        """Valida un token JWT y devuelve sus claims (None si es inválido)"""
+        if not token or token_cache.is_revoked(token):
+            return None
+        claims = token_cache.get(token)
+        if claims is not None:
+            return claims
+        try:
+            claims = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        except JWTError:
+            return None
+        token_cache.put(token, claims)
+        return claims
+
+    @staticmethod
+    def revoke_token(token: Optional[str]) -> None:
+        """Revoca un token (por ejemplo, al cerrar sesión)"""
+        if not token:
+            return
+        try:
+            expires_at = jwt.get_unverified_claims(token).get("exp")
+        except JWTError:
+            expires_at = None
+        token_cache.revoke(token, expires_at)
+
     def register_user(self, user_data: dict) -> User:
         """Registra un nuevo usuario"""
         # Verificar si el usuario ya existe
@@ -56,7 +137,7 @@ class AuthService:
             email=user_data["email"],
             role=UserRole[user_data.get("role", "EMPLOYEE").upper()]
         )
-        user.set_password(user_data["password"])
+        _password_pool.submit(user.set_password, user_data["password"]).result()
         
         self.db.add(user)
         self.db.flush()  # Para obtener el ID del usuario
@@ -0,0 +1,37 @@
+"""
+Versiones de datos por tabla para saber si una vista quedó desactualizada
+"""
+import threading
+from typing import Dict
+
+
+class ChangeTracker:
+    """
+    Lleva un contador de versión por tabla. Los servicios lo incrementan
+    después de confirmar cambios y las vistas en caché comparan una foto
+    de las versiones para decidir si deben volver a consultar.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._versions: Dict[str, int] = {}
+
+    def bump(self, *tables: str) -> None:
+        with self._lock:
+            for table in tables:
+                self._versions[table] = self._versions.get(table, 0) + 1
+
+    def snapshot(self, *tables: str) -> Dict[str, int]:
+        with self._lock:
+            return {table: self._versions.get(table, 0) for table in tables}
+
+    def is_stale(self, snapshot: Dict[str, int]) -> bool:
+        with self._lock:
+            return any(
+                self._versions.get(table, 0) != version
+                for table, version in snapshot.items()
+            )
+
+
+# Registro compartido por todas las sesiones del proceso
+change_tracker = ChangeTracker()
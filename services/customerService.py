@@ -1,7 +1,21 @@
-from typing import List, Optional
-from sqlalchemy.orm import Session
-from models.Customer import Customer
+from typing import Iterator, List, NamedTuple, Optional
+from sqlalchemy import func, literal, or_, select
+from sqlalchemy.orm import Session, selectinload
+from config.settings import STREAM_CHUNK_SIZE
+from database.instrumentation import track_queries
+from models.Customer import Customer, search_key
+from models.Sale import Sale
+from services.changeTracker import change_tracker
+from services.pagination import Page, keyset_paginate, NEXT, DEFAULT_PAGE_SIZE
 
+class CustomerRow(NamedTuple):
+    """Fila de solo lectura del listado de clientes"""
+    id: int
+    name: str
+    email: str
+
+
+@track_queries
 class CustomerService:
     def __init__(self, db: Session):
         self.db = db
@@ -10,6 +24,58 @@ class CustomerService:
         """Obtiene todos los clientes"""
         return self.db.query(Customer).all()
 
+    def iter_customers(self, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[Customer]:
+        """Recorre todos los clientes por lotes, sin cargarlos todos en memoria"""
+        stmt = select(Customer).order_by(Customer.id).execution_options(yield_per=chunk_size)
+        yield from self.db.scalars(stmt)
+
+    # Columnas por las que se puede ordenar el listado de clientes
+    SORT_COLUMNS = {
+        "id": Customer.id,
+        "name": func.lower(Customer.name),
+        "email": func.lower(Customer.email),
+    }
+
+    def get_customers_page(
+        self,
+        cursor: Optional[tuple] = None,
+        direction: str = NEXT,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        search: Optional[str] = None,
+        sort_by: str = "id",
+        descending: bool = False
+    ) -> Page:
+        """Obtiene una página de clientes ordenada por la columna indicada"""
+        return self._paginate_customers(
+            select(Customer), cursor, direction, page_size, search, sort_by, descending)
+
+    def get_customers_listing_page(
+        self,
+        cursor: Optional[tuple] = None,
+        direction: str = NEXT,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        search: Optional[str] = None,
+        sort_by: str = "id",
+        descending: bool = False
+    ) -> Page:
+        """Obtiene una página del listado de clientes como filas de solo lectura"""
+        return self._paginate_customers(
+            select(Customer.id, Customer.name, Customer.email),
+            cursor, direction, page_size, search, sort_by, descending, row_type=CustomerRow)
+
+    def _paginate_customers(self, stmt, cursor, direction, page_size, search, sort_by,
+                            descending, row_type=None) -> Page:
+        if sort_by not in self.SORT_COLUMNS:
+            raise ValueError(f"Columna de orden inválida: {sort_by}")
+        if search:
+            pattern = f"%{search.strip()}%"
+            stmt = stmt.where(or_(Customer.name.ilike(pattern), Customer.email.ilike(pattern)))
+        return keyset_paginate(
+            self.db, stmt, self.SORT_COLUMNS[sort_by], Customer.id,
+            page_size=page_size, cursor=cursor, direction=direction, descending=descending,
+            row_type=row_type
+        )
+
     def get_customer_by_id(self, customer_id: int) -> Optional[Customer]:
         """Obtiene un cliente por su ID"""
         return self.db.query(Customer).filter(Customer.id == customer_id).first()
@@ -18,11 +84,28 @@ class CustomerService:
         """Obtiene un cliente por su email"""
         return self.db.query(Customer).filter(Customer.email == email).first()
 
+    def search_customers(self, term: str, limit: int = 10) -> List[Customer]:
+        """Busca clientes cuyo nombre o email comienza con el texto indicado"""
+        term = term.strip()
+        if not term:
+            return []
+        # Rangos [prefijo, prefijo + U+FFFF) para aprovechar los índices. El
+        # nombre se compara normalizado (sin acentos); el email, con el mismo
+        # lower() de la base de datos que usa su índice
+        name_prefix = search_key(term)
+        email_prefix = func.lower(literal(term))
+        email = func.lower(Customer.email)
+        return self.db.query(Customer).filter(or_(
+            (Customer.name_key >= name_prefix) & (Customer.name_key < name_prefix + "\uffff"),
+            (email >= email_prefix) & (email < email_prefix.concat("\uffff"))
+        )).order_by(Customer.name_key).limit(limit).all()
+
     def create_customer(self, customer_data: dict) -> Customer:
         """Crea un nuevo cliente"""
         customer = Customer(**customer_data)
         self.db.add(customer)
         self.db.commit()
+        change_tracker.bump('customer')
         self.db.refresh(customer)
         return customer
 
@@ -33,14 +116,20 @@ class CustomerService:
             for key, value in customer_data.items():
                 setattr(customer, key, value)
             self.db.commit()
+            change_tracker.bump('customer')
             self.db.refresh(customer)
         return customer
 
     def delete_customer(self, customer_id: int) -> bool:
         """Elimina un cliente"""
-        customer = self.get_customer_by_id(customer_id)
+        # El borrado en cascada recorre ventas y líneas: cargarlas en consultas fijas
+        customer = self.db.query(Customer)\
+            .options(selectinload(Customer.sales).selectinload(Sale.items))\
+            .filter(Customer.id == customer_id)\
+            .first()
         if customer:
             self.db.delete(customer)
             self.db.commit()
+            change_tracker.bump('customer', 'sale')
             return True
         return False
\ No newline at end of file
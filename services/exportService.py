@@ -0,0 +1,193 @@
+"""
+Exportación de tablas a archivos CSV por lotes, en segundo plano
+"""
+import contextvars
+import csv
+import logging
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from config.settings import EXPORT_DIR, STREAM_CHUNK_SIZE
+from database.connection import session_scope
+from database.instrumentation import track_queries
+from models.Customer import Customer
+from models.Product import Product
+from models.Sale import Sale
+from models.SaleItem import SaleItem
+from models.Supplier import Supplier
+from .customerService import CustomerService
+from .productService import ProductService
+from .supplierService import SupplierService
+
+# Recibe (filas escritas, total de filas)
+ProgressCallback = Callable[[int, int], None]
+
+
+class ExportCancelled(Exception):
+    """Se lanza cuando se cancela una exportación en curso"""
+
+
+def default_export_path(prefix: str) -> Path:
+    """Ruta del archivo de una exportación nueva dentro de EXPORT_DIR"""
+    EXPORT_DIR.mkdir(parents=True, exist_ok=True)
+    return EXPORT_DIR / f"{prefix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+
+
+@track_queries
+class ExportService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def export_customers(self, path, progress: Optional[ProgressCallback] = None) -> int:
+        """Exporta los clientes a un archivo CSV"""
+        total = self.db.scalar(select(func.count(Customer.id)))
+        rows = (
+            (customer.id, customer.name, customer.email, customer.created_at)
+            for customer in CustomerService(self.db).iter_customers()
+        )
+        return self._write_csv(
+            path, ["ID", "Nombre", "Email", "Fecha de alta"], rows, total, progress)
+
+    def export_products(self, path, progress: Optional[ProgressCallback] = None) -> int:
+        """Exporta los productos a un archivo CSV"""
+        total = self.db.scalar(select(func.count(Product.id)))
+        rows = (
+            (product.id, product.name, product.price, product.stock)
+            for product in ProductService(self.db).iter_products()
+        )
+        return self._write_csv(path, ["ID", "Nombre", "Precio", "Stock"], rows, total, progress)
+
+    def export_suppliers(self, path, progress: Optional[ProgressCallback] = None) -> int:
+        """Exporta los proveedores a un archivo CSV"""
+        total = self.db.scalar(select(func.count(Supplier.id)))
+        rows = (
+            (supplier.id, supplier.name, supplier.email, supplier.phone,
+             supplier.address, supplier.description)
+            for supplier in SupplierService(self.db).iter_suppliers()
+        )
+        return self._write_csv(
+            path, ["ID", "Nombre", "Email", "Teléfono", "Dirección", "Descripción"],
+            rows, total, progress)
+
+    def export_sale_items(
+        self,
+        path,
+        from_date: datetime,
+        to_date: datetime,
+        progress: Optional[ProgressCallback] = None
+    ) -> int:
+        """Exporta las líneas de las ventas de un rango de fechas a un archivo CSV"""
+        in_range = (Sale.date >= from_date, Sale.date <= to_date)
+        total = self.db.scalar(
+            select(func.count(SaleItem.id)).join(Sale, SaleItem.sale_id == Sale.id).where(*in_range))
+        stmt = select(
+            Sale.id, Sale.date, Customer.name, Sale.payment_method, Sale.status,
+            SaleItem.product_id, Product.name, SaleItem.quantity,
+            SaleItem.unit_price, SaleItem.subtotal
+        ).join(SaleItem, SaleItem.sale_id == Sale.id)\
+            .outerjoin(Customer, Sale.customer_id == Customer.id)\
+            .outerjoin(Product, SaleItem.product_id == Product.id)\
+            .where(*in_range)\
+            .order_by(Sale.date, Sale.id, SaleItem.id)\
+            .execution_options(yield_per=STREAM_CHUNK_SIZE)
+        return self._write_csv(
+            path,
+            ["Venta", "Fecha", "Cliente", "Método de pago", "Estado", "ID Producto",
+             "Producto", "Cantidad", "Precio unitario", "Subtotal"],
+            self.db.execute(stmt), total, progress)
+
+    def _write_csv(self, path, header: list, rows: Iterable, total: int,
+                   progress: Optional[ProgressCallback]) -> int:
+        """
+        Escribe las filas en un archivo temporal y lo renombra al terminar,
+        para que nunca quede a la vista un archivo incompleto.
+        """
+        path = Path(path)
+        partial = path.with_name(path.name + ".part")
+        written = 0
+        try:
+            # utf-8-sig para que Excel reconozca los acentos
+            with open(partial, "w", newline="", encoding="utf-8-sig") as f:
+                writer = csv.writer(f)
+                writer.writerow(header)
+                for row in rows:
+                    writer.writerow(row)
+                    written += 1
+                    if progress and written % STREAM_CHUNK_SIZE == 0:
+                        progress(written, total)
+            if progress:
+                progress(written, total)
+            os.replace(partial, path)
+        except BaseException:
+            if partial.exists():
+                partial.unlink()
+            raise
+        return written
+
+
+class ExportJob:
+    """
+    Ejecuta un método export_* de ExportService en un hilo con su propia
+    sesión. Los callbacks se invocan desde ese hilo.
+    """
+
+    def __init__(
+        self,
+        export: str,
+        path,
+        on_progress: Optional[ProgressCallback] = None,
+        on_done: Optional[Callable[[Path, int], None]] = None,
+        on_error: Optional[Callable[[Exception], None]] = None,
+        **params
+    ):
+        self.export = export
+        self.path = Path(path)
+        self.params = params
+        self.on_progress = on_progress
+        self.on_done = on_done
+        self.on_error = on_error
+        self._cancelled = threading.Event()
+        self._thread = None
+
+    def start(self) -> None:
+        # El hilo hereda el contexto (la página de Flet) para atribuir sus consultas al cliente
+        context = contextvars.copy_context()
+        self._thread = threading.Thread(
+            target=context.run, args=(self._run,), name=f"export-{self.export}", daemon=True)
+        self._thread.start()
+
+    def cancel(self) -> None:
+        """
+        Detiene la exportación en el próximo lote y descarta el archivo
+        parcial. Desde ese momento no se invoca ningún callback.
+        """
+        self._cancelled.set()
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _progress(self, written: int, total: int) -> None:
+        if self._cancelled.is_set():
+            raise ExportCancelled()
+        if self.on_progress:
+            self.on_progress(written, total)
+
+    def _run(self) -> None:
+        try:
+            with session_scope() as db:
+                export = getattr(ExportService(db), f"export_{self.export}")
+                written = export(self.path, progress=self._progress, **self.params)
+        except ExportCancelled:
+            return
+        except Exception as e:
+            logging.error(f"Error exporting {self.export}: {str(e)}")
+            if self.on_error and not self._cancelled.is_set():
+                self.on_error(e)
+            return
+        # Cancelada después del último lote: el archivo queda, pero la UI ya informó la cancelación
+        if self.on_done and not self._cancelled.is_set():
+            self.on_done(self.path, written)
@@ -0,0 +1,83 @@
+"""
+Limitación de intentos de inicio de sesión por usuario e IP
+"""
+import threading
+import time
+from collections import deque
+from typing import Dict, Iterable
+from config.settings import (
+    LOGIN_MAX_ATTEMPTS, LOGIN_ATTEMPT_WINDOW_SECONDS, LOGIN_LOCKOUT_SECONDS
+)
+
+
+class LoginThrottle:
+    """
+    Cuenta los intentos fallidos por clave (usuario o IP) dentro de una
+    ventana de tiempo y bloquea la clave al superar el máximo.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = LOGIN_MAX_ATTEMPTS,
+        window_seconds: int = LOGIN_ATTEMPT_WINDOW_SECONDS,
+        lockout_seconds: int = LOGIN_LOCKOUT_SECONDS
+    ):
+        self.max_attempts = max_attempts
+        self.window_seconds = window_seconds
+        self.lockout_seconds = lockout_seconds
+        self._lock = threading.Lock()
+        self._failures: Dict[str, deque] = {}
+        self._locked_until: Dict[str, float] = {}
+        self._next_sweep = 0.0
+
+    def retry_after(self, keys: Iterable[str]) -> int:
+        """Segundos que faltan para poder reintentar (0 si no hay bloqueo)"""
+        now = time.monotonic()
+        with self._lock:
+            remaining = 0
+            for key in keys:
+                until = self._locked_until.get(key)
+                if until is None:
+                    continue
+                if until <= now:
+                    del self._locked_until[key]
+                else:
+                    remaining = max(remaining, int(until - now) + 1)
+            return remaining
+
+    def record_failure(self, keys: Iterable[str]) -> None:
+        now = time.monotonic()
+        with self._lock:
+            for key in keys:
+                failures = self._failures.setdefault(key, deque())
+                failures.append(now)
+                while failures and failures[0] <= now - self.window_seconds:
+                    failures.popleft()
+                if len(failures) >= self.max_attempts:
+                    self._locked_until[key] = now + self.lockout_seconds
+                    del self._failures[key]
+            if now >= self._next_sweep:
+                self._sweep(now)
+
+    def _sweep(self, now: float) -> None:
+        """
+        Descarta las claves sin fallos dentro de la ventana ni bloqueo vigente,
+        para que probar nombres de usuario distintos no acumule memoria.
+        Se ejecuta a lo sumo una vez por ventana.
+        """
+        cutoff = now - self.window_seconds
+        for key in [key for key, failures in self._failures.items() if failures[-1] <= cutoff]:
+            del self._failures[key]
+        for key in [key for key, until in self._locked_until.items() if until <= now]:
+            del self._locked_until[key]
+        self._next_sweep = now + self.window_seconds
+
+    def reset(self, keys: Iterable[str]) -> None:
+        with self._lock:
+            for key in keys:
+                self._failures.pop(key, None)
+                self._locked_until.pop(key, None)
+
+
+# Limitador compartido por todas las sesiones del proceso
+login_throttle = LoginThrottle()
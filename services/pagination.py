@@ -0,0 +1,119 @@
+"""
+Paginación por cursor (keyset) para los listados de los servicios
+"""
+from typing import Any, List, Optional, Tuple
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+NEXT = "next"
+PREV = "prev"
+
+DEFAULT_PAGE_SIZE = 20
+
+
+class Page:
+    """
+    Resultado de una consulta paginada.
+
+    Atributos:
+        items (list): Elementos de la página
+        next_cursor (tuple): Cursor para la página siguiente, o None
+        prev_cursor (tuple): Cursor para la página anterior, o None
+    """
+
+    def __init__(self, items: List[Any], next_cursor: Optional[Tuple], prev_cursor: Optional[Tuple]):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __repr__(self):
+        return f"Page(items={len(self.items)}, next={self.next_cursor}, prev={self.prev_cursor})"
+
+
+def _selects_single_entity(stmt: Select) -> bool:
+    descriptions = stmt.column_descriptions
+    return len(descriptions) == 1 and isinstance(descriptions[0]["expr"], type)
+
+
+def _beyond_cursor(sort_column, id_column, cursor: Tuple, reverse: bool):
+    """
+    Filas posteriores (o anteriores, si reverse) al cursor. Se expande
+    sort > :v OR (sort = :v AND id > :id) en lugar de comparar tuplas:
+    SQLite no busca en un índice de expresión (lower()) con (sort, id) > (...)
+    y lo recorre desde el principio en cada página.
+    """
+    sort_value, id_value = cursor
+    if sort_column is id_column:
+        return id_column < id_value if reverse else id_column > id_value
+    if reverse:
+        return or_(sort_column < sort_value,
+                   and_(sort_column == sort_value, id_column < id_value))
+    return or_(sort_column > sort_value,
+               and_(sort_column == sort_value, id_column > id_value))
+
+
+def keyset_paginate(
+    db: Session,
+    stmt: Select,
+    sort_column,
+    id_column,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[Tuple] = None,
+    direction: str = NEXT,
+    descending: bool = False,
+    row_type=None
+) -> Page:
+    """
+    Obtiene una página de stmt ordenada por (sort_column, id_column).
+
+    El cursor es la tupla (valor de orden, id) de la última fila (NEXT) o de
+    la primera fila (PREV) de la página mostrada. Cada página es una única
+    consulta con LIMIT que puede resolverse con un índice sobre la clave.
+    Si stmt selecciona columnas, row_type (un NamedTuple) recibe las filas
+    sin las columnas auxiliares del cursor.
+    """
+    single_entity = _selects_single_entity(stmt)
+
+    # Al retroceder se recorre el índice en sentido inverso
+    backwards = direction == PREV
+    reverse = descending != backwards
+
+    paged = stmt.add_columns(sort_column.label("sort_key"), id_column.label("sort_id"))
+    if cursor is not None:
+        paged = paged.where(_beyond_cursor(sort_column, id_column, cursor, reverse))
+    if reverse:
+        paged = paged.order_by(None).order_by(sort_column.desc(), id_column.desc())
+    else:
+        paged = paged.order_by(None).order_by(sort_column.asc(), id_column.asc())
+
+    rows = db.execute(paged.limit(page_size + 1)).all()
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    if backwards:
+        rows.reverse()
+
+    first_key = (rows[0].sort_key, rows[0].sort_id) if rows else None
+    last_key = (rows[-1].sort_key, rows[-1].sort_id) if rows else None
+
+    if backwards:
+        next_cursor = last_key
+        prev_cursor = first_key if has_more else None
+    else:
+        next_cursor = last_key if has_more else None
+        prev_cursor = first_key if cursor is not None else None
+
+    if single_entity:
+        items = [row[0] for row in rows]
+    elif row_type is not None:
+        width = len(row_type._fields)
+        items = [row_type._make(row[:width]) for row in rows]
+    else:
+        items = rows
+    return Page(items, next_cursor, prev_cursor)
@@ -0,0 +1,121 @@
+"""
+Caché en memoria del catálogo de productos
+"""
+import threading
+from collections import OrderedDict
+from typing import Iterable, List, Optional
+from models.Product import Product
+from config.settings import PRODUCT_CACHE_SIZE
+
+
+def _snapshot(product: Product) -> Product:
+    """Crea una copia desvinculada de la sesión, de solo lectura"""
+    return Product(
+        id=product.id,
+        name=product.name,
+        price=product.price,
+        stock=product.stock
+    )
+
+
+class ProductCache:
+    """
+    Caché LRU de productos por ID y del catálogo completo.
+
+    Guarda copias desvinculadas de la sesión, por lo que puede compartirse
+    entre vistas y sesiones. Los servicios la invalidan después de
+    confirmar cualquier cambio sobre productos o su stock.
+
+    Para no guardar datos leídos antes de una invalidación, quien llena la
+    caché toma generation() antes de consultar la base de datos y lo pasa a
+    put o set_catalog; si hubo una invalidación entre medio, la copia se
+    devuelve pero no se guarda.
+    """
+
+    def __init__(self, max_size: int = PRODUCT_CACHE_SIZE):
+        self.max_size = max_size
+        self._lock = threading.RLock()
+        self._items = OrderedDict()
+        self._catalog = None
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, product_id: int) -> Optional[Product]:
+        with self._lock:
+            product = self._items.get(product_id)
+            if product is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(product_id)
+            self.hits += 1
+            return product
+
+    def generation(self) -> int:
+        """Contador que aumenta con cada invalidación"""
+        with self._lock:
+            return self._generation
+
+    def put(self, product: Product, generation: Optional[int] = None) -> Product:
+        snapshot = _snapshot(product)
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return snapshot
+            self._items[snapshot.id] = snapshot
+            self._items.move_to_end(snapshot.id)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+        return snapshot
+
+    def get_catalog(self) -> Optional[List[Product]]:
+        with self._lock:
+            if self._catalog is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return list(self._catalog)
+
+    def set_catalog(
+        self,
+        products: Iterable[Product],
+        generation: Optional[int] = None
+    ) -> List[Product]:
+        snapshots = [_snapshot(product) for product in products]
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return list(snapshots)
+            self._catalog = snapshots
+            for snapshot in snapshots[-self.max_size:]:
+                self._items[snapshot.id] = snapshot
+                self._items.move_to_end(snapshot.id)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+        return list(snapshots)
+
+    def invalidate(self, product_ids: Iterable[int] = ()) -> None:
+        """Descarta los productos indicados y el catálogo completo"""
+        with self._lock:
+            self._generation += 1
+            for product_id in product_ids:
+                self._items.pop(product_id, None)
+            self._catalog = None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._items.clear()
+            self._catalog = None
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._items),
+                "hit_ratio": self.hits / lookups if lookups else 0.0
+            }
+
+
+# Caché compartida por todas las sesiones del proceso
+product_cache = ProductCache()
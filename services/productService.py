@@ -1,23 +1,109 @@
-from typing import List, Optional
+from typing import Iterator, List, NamedTuple, Optional
+from sqlalchemy import func, select, text
 from sqlalchemy.orm import Session
-from models.Product import Product
+from config.settings import STREAM_CHUNK_SIZE
+from database.instrumentation import track_queries
+from models.Product import Product, LOW_STOCK_THRESHOLD
+from services.productCache import product_cache
+from services.changeTracker import change_tracker
+from services.pagination import Page, keyset_paginate, NEXT, DEFAULT_PAGE_SIZE
+from database.search import (
+    PRODUCT_SEARCH_TABLE, MIN_TRIGRAM_QUERY, product_search_available, fts_phrase
+)
 
+class ProductRow(NamedTuple):
+    """Fila de solo lectura del listado de productos"""
+    id: int
+    name: str
+    price: float
+    stock: int
+
+
+@track_queries
 class ProductService:
     def __init__(self, db: Session):
         self.db = db
 
     def get_all_products(self) -> List[Product]:
-        """Obtiene todos los productos"""
-        return self.db.query(Product).all()
+        """Obtiene todos los productos (copias de solo lectura en caché)"""
+        products = product_cache.get_catalog()
+        if products is None:
+            generation = product_cache.generation()
+            products = product_cache.set_catalog(self.db.query(Product).all(), generation)
+        return products
+
+    def iter_products(self, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[Product]:
+        """Recorre todos los productos por lotes, sin cargarlos todos en memoria"""
+        stmt = select(Product).order_by(Product.id).execution_options(yield_per=chunk_size)
+        yield from self.db.scalars(stmt)
 
     def get_product_by_id(self, product_id: int) -> Optional[Product]:
-        """Obtiene un producto por su ID"""
-        return self.db.query(Product).filter(Product.id == product_id).first()
+        """Obtiene un producto por su ID (copia de solo lectura en caché)"""
+        product = product_cache.get(product_id)
+        if product is None:
+            generation = product_cache.generation()
+            product = self._get_product(product_id)
+            if product:
+                product = product_cache.put(product, generation)
+        return product
+
+    def get_products_page(
+        self,
+        cursor: Optional[tuple] = None,
+        direction: str = NEXT,
+        page_size: int = DEFAULT_PAGE_SIZE
+    ) -> Page:
+        """Obtiene una página de productos ordenada por ID"""
+        return keyset_paginate(
+            self.db, select(Product), Product.id, Product.id,
+            page_size=page_size, cursor=cursor, direction=direction
+        )
+
+    def get_products_listing_page(
+        self,
+        cursor: Optional[tuple] = None,
+        direction: str = NEXT,
+        page_size: int = DEFAULT_PAGE_SIZE
+    ) -> Page:
+        """Obtiene una página del listado de productos como filas de solo lectura"""
+        stmt = select(Product.id, Product.name, Product.price, Product.stock)
+        return keyset_paginate(
+            self.db, stmt, Product.id, Product.id,
+            page_size=page_size, cursor=cursor, direction=direction, row_type=ProductRow
+        )
+
+    def get_cache_stats(self) -> dict:
+        """Obtiene los contadores de aciertos y fallos de la caché de productos"""
+        return product_cache.stats()
 
     def get_products_by_name(self, name: str) -> List[Product]:
         """Obtiene productos por su nombre"""
         return self.db.query(Product).filter(Product.name.ilike(f"%{name}%")).all()
 
+    def search_products(self, query: str, limit: int = 50) -> List[Product]:
+        """Busca productos por nombre ordenados por relevancia"""
+        query = query.strip()
+        dialect = self.db.get_bind().dialect.name
+
+        if len(query) >= MIN_TRIGRAM_QUERY and self._search_index_enabled():
+            return self.db.query(Product).from_statement(text(
+                f"SELECT product.* FROM product "
+                f"JOIN {PRODUCT_SEARCH_TABLE} ON {PRODUCT_SEARCH_TABLE}.rowid = product.id "
+                f"WHERE {PRODUCT_SEARCH_TABLE} MATCH :query "
+                f"ORDER BY {PRODUCT_SEARCH_TABLE}.rank LIMIT :limit"
+            ).bindparams(query=fts_phrase(query), limit=limit)).all()
+
+        if dialect == "postgresql":
+            return self.db.query(Product)\
+                .filter(Product.name.ilike(f"%{query}%"))\
+                .order_by(func.similarity(Product.name, query).desc())\
+                .limit(limit).all()
+
+        return self.db.query(Product)\
+            .filter(Product.name.ilike(f"%{query}%"))\
+            .order_by(Product.name)\
+            .limit(limit).all()
+
     def get_products_by_category(self, category: str) -> List[Product]:
         """Obtiene productos por su categoría"""
         return self.db.query(Product).filter(Product.category.ilike(f"%{category}%")).all()
@@ -26,30 +112,48 @@ class ProductService:
         """Obtiene productos por rango de precio"""
         return self.db.query(Product).filter(Product.price >= min_price, Product.price <= max_price).all()
 
+    def count_products(self) -> int:
+        """Cuenta la cantidad de productos"""
+        return self.db.query(func.count(Product.id)).scalar()
+
+    def count_low_stock_products(self, threshold: int = LOW_STOCK_THRESHOLD) -> int:
+        """Cuenta los productos con stock por debajo del umbral"""
+        return self.db.query(func.count(Product.id)).filter(Product.stock < threshold).scalar()
+
     def create_product(self, product_data: dict) -> Product:
         """Crea un nuevo producto"""
         product = Product(**product_data)
         self.db.add(product)
+        self.db.flush()
+        self._index_product(product)
         self.db.commit()
+        product_cache.invalidate()
+        change_tracker.bump('product')
         self.db.refresh(product)
         return product
 
     def update_product(self, product_id: int, product_data: dict) -> Optional[Product]:
         """Actualiza un producto existente"""
-        product = self.get_product_by_id(product_id)
+        product = self._get_product(product_id)
         if product:
             for key, value in product_data.items():
                 setattr(product, key, value)
+            self._index_product(product)
             self.db.commit()
+            product_cache.invalidate([product_id])
+            change_tracker.bump('product')
             self.db.refresh(product)
         return product
 
     def delete_product(self, product_id: int) -> bool:
         """Elimina un producto"""
-        product = self.get_product_by_id(product_id)
+        product = self._get_product(product_id)
         if product:
+            self._unindex_product(product.id)
             self.db.delete(product)
             self.db.commit()
+            product_cache.invalidate([product_id])
+            change_tracker.bump('product')
             return True
         return False
 
@@ -57,7 +161,38 @@ class ProductService:
         """Elimina todos los productos"""
         try:
             self.db.query(Product).delete()
+            if self._search_index_enabled():
+                self.db.execute(text(f"DELETE FROM {PRODUCT_SEARCH_TABLE}"))
             self.db.commit()
+            product_cache.clear()
+            change_tracker.bump('product')
             return True
         except:
-            return False
\ No newline at end of file
+            return False
+
+    def _get_product(self, product_id: int) -> Optional[Product]:
+        """Obtiene un producto de la sesión actual, sin pasar por la caché"""
+        return self.db.query(Product).filter(Product.id == product_id).first()
+
+    def _search_index_enabled(self) -> bool:
+        """Indica si el motor actual tiene la tabla FTS5 de productos"""
+        return product_search_available(self.db.get_bind())
+
+    def _index_product(self, product: Product) -> None:
+        """Sincroniza un producto con el índice de búsqueda"""
+        if not self._search_index_enabled():
+            return
+        self._unindex_product(product.id)
+        self.db.execute(
+            text(f"INSERT INTO {PRODUCT_SEARCH_TABLE}(rowid, name) VALUES (:id, :name)"),
+            {"id": product.id, "name": product.name}
+        )
+
+    def _unindex_product(self, product_id: int) -> None:
+        """Elimina un producto del índice de búsqueda"""
+        if not self._search_index_enabled():
+            return
+        self.db.execute(
+            text(f"DELETE FROM {PRODUCT_SEARCH_TABLE} WHERE rowid = :id"),
+            {"id": product_id}
+        )
@@ -1,16 +1,25 @@
 import logging
 from typing import List, Optional
 from datetime import datetime
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session, contains_eager, selectinload
+from database.instrumentation import track_queries
 from models.Sale import Sale
 from models.SaleItem import SaleItem
 from models.Product import Product
+from models.Customer import Customer
 from .productService import ProductService
+from .productCache import product_cache
+from .changeTracker import change_tracker
+from .pagination import Page, keyset_paginate, NEXT, DEFAULT_PAGE_SIZE
+from .salesSummaryService import SalesSummaryService
 
+@track_queries
 class SaleService:
     def __init__(self, db: Session):
         self.db = db
         self.product_service = ProductService(db)
+        self.summary_service = SalesSummaryService(db)
 
     def create_sale(self, sale_data: dict) -> Sale:
         try:
@@ -26,6 +35,24 @@ class SaleService:
             self.db.add(sale)
             self.db.flush()  # Get sale.id
 
+            # Cantidades solicitadas por producto
+            quantities = {}
+            for item in sale_data['items']:
+                product_id = int(item['product_id'])
+                quantity = int(item['quantity'])
+                if quantity <= 0:
+                    raise ValueError(f"Cantidad inválida para el producto ID {product_id}")
+                quantities[product_id] = quantities.get(product_id, 0) + quantity
+
+            # Cargar todos los productos del carrito en una sola consulta
+            products = {
+                product.id: product
+                for product in self.db.query(Product).filter(Product.id.in_(quantities)).all()
+            }
+            missing = set(quantities) - set(products)
+            if missing:
+                raise ValueError(f"Productos no encontrados: {sorted(missing)}")
+
             # Process items
             for item in sale_data['items']:
                 # Calculate subtotal
@@ -42,13 +69,22 @@ class SaleService:
                 )
                 self.db.add(sale_item)
 
-                # Update product stock
-                product = self.product_service.get_product_by_id(item['product_id'])
-                if product:
-                    product.stock -= quantity
+            # Descontar stock de forma atómica: falla si otra terminal ya lo consumió
+            for product_id, quantity in quantities.items():
+                result = self.db.execute(
+                    update(Product)
+                    .where(Product.id == product_id, Product.stock >= quantity)
+                    .values(stock=Product.stock - quantity)
+                )
+                if result.rowcount != 1:
+                    raise ValueError(
+                        f"Stock insuficiente para el producto ID {product_id}")
 
             sale.status = 'completed'
+            self.summary_service.record_sale(sale, sum(quantities.values()))
             self.db.commit()
+            product_cache.invalidate(quantities)
+            change_tracker.bump('sale', 'product')
             return sale
 
         except Exception as e:
@@ -78,14 +114,30 @@ class SaleService:
 
     def get_total_sales_amount(self, start_date: datetime, end_date: datetime) -> float:
         """Calcula el total de ventas en un rango de fechas"""
-        sales = self.get_sales_by_date_range(start_date, end_date)
-        return sum(sale.total_amount for sale in sales)
+        total = self.db.query(func.coalesce(func.sum(Sale.total_amount), 0.0)).filter(
+            Sale.date >= start_date,
+            Sale.date <= end_date
+        ).scalar()
+        return float(total)
+
+    def get_sales_summary(self, start_date: datetime, end_date: datetime) -> dict:
+        """Obtiene cantidad, total y promedio de ventas en un rango de fechas"""
+        count, total, average = self.db.query(
+            func.count(Sale.id),
+            func.coalesce(func.sum(Sale.total_amount), 0.0),
+            func.coalesce(func.avg(Sale.total_amount), 0.0)
+        ).filter(
+            Sale.date >= start_date,
+            Sale.date <= end_date
+        ).one()
+        return {"count": count, "total": float(total), "average": float(average)}
     
     def get_sales_between_dates(self, from_date: datetime, to_date: datetime) -> List[Sale]:
         """Obtiene las ventas entre dos fechas con información del cliente"""
         try:
             sales = self.db.query(Sale)\
                 .join(Sale.customer)\
+                .options(contains_eager(Sale.customer))\
                 .filter(
                     Sale.date >= from_date,
                     Sale.date <= to_date
@@ -95,20 +147,69 @@ class SaleService:
             logging.error(f"Error fetching sales: {str(e)}")
             return []
 
+    def _sales_listing_statement(self, from_date: datetime, to_date: datetime):
+        """Consulta con las columnas que muestra el listado de ventas"""
+        return select(
+            Sale.id,
+            Sale.date,
+            Customer.name.label('customer_name'),
+            Sale.payment_method,
+            Sale.total_amount,
+            Sale.status
+        ).outerjoin(Customer, Sale.customer_id == Customer.id)\
+            .where(
+                Sale.date >= from_date,
+                Sale.date <= to_date
+            )
+
+    def get_sales_listing(self, from_date: datetime, to_date: datetime) -> list:
+        """Obtiene las columnas del listado de ventas en una sola consulta"""
+        try:
+            stmt = self._sales_listing_statement(from_date, to_date)\
+                .order_by(Sale.date.desc(), Sale.id.desc())
+            return self.db.execute(stmt).all()
+        except Exception as e:
+            logging.error(f"Error fetching sales listing: {str(e)}")
+            return []
+
+    def get_sales_page(
+        self,
+        from_date: datetime,
+        to_date: datetime,
+        cursor: Optional[tuple] = None,
+        direction: str = NEXT,
+        page_size: int = DEFAULT_PAGE_SIZE
+    ) -> Page:
+        """Obtiene una página del listado de ventas, de la más reciente a la más antigua"""
+        return keyset_paginate(
+            self.db, self._sales_listing_statement(from_date, to_date),
+            Sale.date, Sale.id,
+            page_size=page_size, cursor=cursor, direction=direction, descending=True
+        )
+
     def cancel_sale(self, sale_id: int) -> bool:
         """Cancela una venta y restaura el inventario"""
         try:
-            sale = self.get_sale_by_id(sale_id)
+            # Cargar líneas y productos en consultas fijas, sin carga diferida por línea
+            sale = self.db.query(Sale)\
+                .options(selectinload(Sale.items).selectinload(SaleItem.product))\
+                .filter(Sale.id == sale_id)\
+                .first()
             if not sale or sale.status != 'completed':
                 return False
 
             # Restaurar stock
+            product_ids = []
             for item in sale.items:
                 product = item.product
                 product.stock += item.quantity
+                product_ids.append(item.product_id)
 
             sale.status = 'cancelled'
+            self.summary_service.record_cancellation(sale)
             self.db.commit()
+            product_cache.invalidate(product_ids)
+            change_tracker.bump('sale', 'product')
             return True
 
         except Exception as e:
@@ -0,0 +1,110 @@
+"""
+Servicio para el resumen diario de ventas
+"""
+from typing import List
+from datetime import date, datetime
+from sqlalchemy import case, func
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from database.instrumentation import track_queries
+from models.DailySalesSummary import DailySalesSummary, NO_EMPLOYEE
+from models.Sale import Sale
+from models.SaleItem import SaleItem
+
+# INSERT ... ON CONFLICT DO UPDATE de cada motor soportado
+_UPSERT_INSERTS = {
+    "sqlite": sqlite.insert,
+    "postgresql": postgresql.insert,
+}
+
+_SUMMARY_VALUES = ('sale_count', 'gross_amount', 'cancelled_amount', 'item_count')
+
+@track_queries
+class SalesSummaryService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _increment(self, sale: Sale, **deltas) -> None:
+        """
+        Suma los valores indicados a la fila del día, creándola si no existe.
+        Es una sola sentencia atómica, así dos ventas concurrentes con una
+        clave nueva no chocan con la restricción única.
+        """
+        table = DailySalesSummary.__table__
+        insert = _UPSERT_INSERTS[self.db.get_bind().dialect.name]
+        stmt = insert(table).values(
+            date=(sale.date or datetime.utcnow()).date(),
+            payment_method=sale.payment_method,
+            employee_id=sale.employee_id if sale.employee_id is not None else NO_EMPLOYEE,
+            **{column: deltas.get(column, 0) for column in _SUMMARY_VALUES}
+        )
+        self.db.execute(stmt.on_conflict_do_update(
+            index_elements=[table.c.date, table.c.payment_method, table.c.employee_id],
+            set_={column: table.c[column] + stmt.excluded[column] for column in deltas}
+        ))
+
+    def record_sale(self, sale: Sale, item_count: int) -> None:
+        """Registra una venta nueva en el resumen (sin confirmar la transacción)"""
+        self._increment(
+            sale,
+            sale_count=1,
+            gross_amount=float(sale.total_amount),
+            item_count=int(item_count)
+        )
+
+    def record_cancellation(self, sale: Sale) -> None:
+        """Registra la cancelación de una venta en el resumen (sin confirmar la transacción)"""
+        self._increment(sale, cancelled_amount=float(sale.total_amount))
+
+    def get_summary_between_dates(self, from_date: date, to_date: date) -> List[DailySalesSummary]:
+        """Obtiene las filas del resumen entre dos fechas (inclusive)"""
+        return self.db.query(DailySalesSummary).filter(
+            DailySalesSummary.date >= from_date,
+            DailySalesSummary.date <= to_date
+        ).order_by(DailySalesSummary.date).all()
+
+    def rebuild(self) -> int:
+        """Reconstruye el resumen completo a partir de la tabla de ventas"""
+        items_per_sale = self.db.query(
+            SaleItem.sale_id.label('sale_id'),
+            func.sum(SaleItem.quantity).label('quantity')
+        ).group_by(SaleItem.sale_id).subquery()
+
+        sale_day = func.date(Sale.date)
+        employee = func.coalesce(Sale.employee_id, NO_EMPLOYEE)
+        rows = self.db.query(
+            sale_day,
+            Sale.payment_method,
+            employee,
+            func.count(Sale.id),
+            func.coalesce(func.sum(Sale.total_amount), 0.0),
+            func.coalesce(func.sum(case(
+                (Sale.status == 'cancelled', Sale.total_amount), else_=0.0)), 0.0),
+            func.coalesce(func.sum(items_per_sale.c.quantity), 0)
+        ).outerjoin(
+            items_per_sale, items_per_sale.c.sale_id == Sale.id
+        ).filter(
+            Sale.status != 'pending'
+        ).group_by(
+            sale_day, Sale.payment_method, employee
+        ).all()
+
+        try:
+            self.db.query(DailySalesSummary).delete()
+            for day, payment_method, employee_id, count, gross, cancelled, items in rows:
+                if isinstance(day, str):
+                    day = date.fromisoformat(day)
+                self.db.add(DailySalesSummary(
+                    date=day,
+                    payment_method=payment_method,
+                    employee_id=employee_id,
+                    sale_count=count,
+                    gross_amount=float(gross),
+                    cancelled_amount=float(cancelled),
+                    item_count=int(items)
+                ))
+            self.db.commit()
+            return len(rows)
+        except Exception:
+            self.db.rollback()
+            raise
@@ -1,10 +1,25 @@
 """
 Servicio para la gestión de proveedores
 """
-from typing import List, Optional
+from typing import Iterator, List, NamedTuple, Optional
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from config.settings import STREAM_CHUNK_SIZE
+from database.instrumentation import track_queries
 from models.Supplier import Supplier
+from services.changeTracker import change_tracker
+from services.pagination import Page, keyset_paginate, NEXT, DEFAULT_PAGE_SIZE
 
+class SupplierRow(NamedTuple):
+    """Fila de solo lectura del listado de proveedores"""
+    id: int
+    name: str
+    email: str
+    phone: Optional[str]
+    address: str
+
+
+@track_queries
 class SupplierService:
     def __init__(self, db: Session):
         self.db = db
@@ -13,6 +28,37 @@ class SupplierService:
         """Obtiene todos los proveedores"""
         return self.db.query(Supplier).all()
 
+    def iter_suppliers(self, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[Supplier]:
+        """Recorre todos los proveedores por lotes, sin cargarlos todos en memoria"""
+        stmt = select(Supplier).order_by(Supplier.id).execution_options(yield_per=chunk_size)
+        yield from self.db.scalars(stmt)
+
+    def get_suppliers_page(
+        self,
+        cursor: Optional[tuple] = None,
+        direction: str = NEXT,
+        page_size: int = DEFAULT_PAGE_SIZE
+    ) -> Page:
+        """Obtiene una página de proveedores ordenada por ID"""
+        return keyset_paginate(
+            self.db, select(Supplier), Supplier.id, Supplier.id,
+            page_size=page_size, cursor=cursor, direction=direction
+        )
+
+    def get_suppliers_listing_page(
+        self,
+        cursor: Optional[tuple] = None,
+        direction: str = NEXT,
+        page_size: int = DEFAULT_PAGE_SIZE
+    ) -> Page:
+        """Obtiene una página del listado de proveedores como filas de solo lectura"""
+        stmt = select(
+            Supplier.id, Supplier.name, Supplier.email, Supplier.phone, Supplier.address)
+        return keyset_paginate(
+            self.db, stmt, Supplier.id, Supplier.id,
+            page_size=page_size, cursor=cursor, direction=direction, row_type=SupplierRow
+        )
+
     def get_supplier_by_id(self, supplier_id: int) -> Optional[Supplier]:
         """Obtiene un proveedor por su ID"""
         return self.db.query(Supplier).filter(Supplier.id == supplier_id).first()
@@ -22,6 +68,7 @@ class SupplierService:
         supplier = Supplier(**supplier_data)
         self.db.add(supplier)
         self.db.commit()
+        change_tracker.bump('supplier')
         self.db.refresh(supplier)
         return supplier
 
@@ -32,6 +79,7 @@ class SupplierService:
             for key, value in supplier_data.items():
                 setattr(supplier, key, value)
             self.db.commit()
+            change_tracker.bump('supplier')
             self.db.refresh(supplier)
         return supplier
 
@@ -41,5 +89,6 @@ class SupplierService:
         if supplier:
             self.db.delete(supplier)
             self.db.commit()
+            change_tracker.bump('supplier')
             return True
         return False
\ No newline at end of file
@@ -0,0 +1,70 @@
+"""
+Caché de tokens JWT ya verificados
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+from config.settings import TOKEN_CACHE_TTL_SECONDS, TOKEN_CACHE_SIZE
+
+
+class TokenCache:
+    """
+    Guarda los claims de tokens ya verificados durante un TTL corto (nunca
+    más allá de su expiración) y mantiene la lista de tokens revocados.
+    """
+
+    def __init__(self, ttl_seconds: int = TOKEN_CACHE_TTL_SECONDS, max_size: int = TOKEN_CACHE_SIZE):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._claims = OrderedDict()
+        self._revoked = {}
+
+    def get(self, token: str) -> Optional[dict]:
+        now = time.time()
+        with self._lock:
+            entry = self._claims.get(token)
+            if entry is None:
+                return None
+            claims, valid_until = entry
+            if valid_until <= now:
+                del self._claims[token]
+                return None
+            self._claims.move_to_end(token)
+            return claims
+
+    def put(self, token: str, claims: dict) -> None:
+        now = time.time()
+        valid_until = now + self.ttl_seconds
+        if claims.get("exp") is not None:
+            valid_until = min(valid_until, float(claims["exp"]))
+        with self._lock:
+            self._claims[token] = (claims, valid_until)
+            self._claims.move_to_end(token)
+            while len(self._claims) > self.max_size:
+                self._claims.popitem(last=False)
+
+    def revoke(self, token: str, expires_at: Optional[float] = None) -> None:
+        """Revoca el token hasta su expiración"""
+        now = time.time()
+        with self._lock:
+            self._claims.pop(token, None)
+            self._revoked[token] = expires_at or now + self.ttl_seconds
+            # Descartar revocaciones de tokens que ya expiraron
+            for revoked, until in list(self._revoked.items()):
+                if until <= now:
+                    del self._revoked[revoked]
+
+    def is_revoked(self, token: str) -> bool:
+        with self._lock:
+            return token in self._revoked
+
+    def clear(self) -> None:
+        """Descarta los claims verificados (las revocaciones se mantienen)"""
+        with self._lock:
+            self._claims.clear()
+
+
+# Caché compartida por todas las sesiones del proceso
+token_cache = TokenCache()
@@ -0,0 +1,97 @@
+"""
+Búsqueda con retardo (debounce) reutilizable para campos de búsqueda
+"""
+import contextvars
+import threading
+import time
+from typing import Any, Callable, Optional
+
+
+class DebouncedSearch:
+    """
+    Agrupa las pulsaciones de un campo de búsqueda y ejecuta la consulta
+    fuera del hilo de la UI.
+
+    Un único hilo por campo ejecuta las consultas de a una. Cada pulsación
+    reinicia la espera; los valores reemplazados antes de consultarse se
+    omiten y se descartan los resultados de consultas que quedaron viejas
+    mientras se ejecutaban. El hilo termina cuando no queda nada pendiente.
+    """
+
+    def __init__(
+        self,
+        search_fn: Callable[[Any], Any],
+        on_results: Callable[[Any], None],
+        delay: float = 0.3,
+        on_error: Optional[Callable[[Exception], None]] = None
+    ):
+        self.search_fn = search_fn
+        self.on_results = on_results
+        self.delay = delay
+        self.on_error = on_error
+        self._condition = threading.Condition()
+        # (generación, valor, contexto) de la próxima búsqueda
+        self._pending = None
+        self._deadline = 0.0
+        self._generation = 0
+        self._worker = None
+
+    def on_change(self, e):
+        """Manejador para el evento on_change de un TextField"""
+        self.trigger(e.control.value)
+
+    def trigger(self, value):
+        """Programa una búsqueda con el valor indicado"""
+        with self._condition:
+            self._generation += 1
+            # La búsqueda hereda el contexto (la página de Flet) para atribuir sus consultas al cliente
+            self._pending = (self._generation, value, contextvars.copy_context())
+            self._deadline = time.monotonic() + self.delay
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._work, name="debounced-search", daemon=True)
+                self._worker.start()
+            self._condition.notify()
+
+    def cancel(self):
+        """Cancela la búsqueda pendiente y descarta las que estén en curso"""
+        with self._condition:
+            self._pending = None
+            self._generation += 1
+            self._condition.notify()
+
+    def _is_current(self, generation: int) -> bool:
+        with self._condition:
+            return generation == self._generation
+
+    def _next(self):
+        """Espera el retardo de la última búsqueda pendiente; None si no hay ninguna"""
+        with self._condition:
+            while self._pending is not None:
+                remaining = self._deadline - time.monotonic()
+                if remaining <= 0:
+                    pending, self._pending = self._pending, None
+                    return pending
+                self._condition.wait(remaining)
+            self._worker = None
+            return None
+
+    def _work(self):
+        while True:
+            pending = self._next()
+            if pending is None:
+                return
+            generation, value, context = pending
+            context.run(self._run, generation, value)
+
+    def _run(self, generation: int, value):
+        if not self._is_current(generation):
+            return
+        try:
+            results = self.search_fn(value)
+        except Exception as e:
+            if self.on_error and self._is_current(generation):
+                self.on_error(e)
+            return
+        if self._is_current(generation):
+            self.on_results(results)
@@ -0,0 +1,101 @@
+"""
+Botón de exportación a CSV con progreso, ejecutada en segundo plano
+"""
+import flet as ft
+from typing import Callable, Optional
+from services.exportService import ExportJob, default_export_path
+from ui.components.alerts import show_error_message, show_success_message
+
+
+class ExportButton(ft.UserControl):
+    """
+    Exporta con ExportService.export_<export> a un archivo en EXPORT_DIR.
+
+    get_params devuelve los argumentos adicionales de la exportación (por
+    ejemplo el rango de fechas) en el momento del clic. Mientras la
+    exportación está en curso, el botón la cancela.
+    """
+
+    def __init__(
+        self,
+        export: str,
+        file_prefix: str,
+        tooltip: str = "Exportar a CSV",
+        get_params: Optional[Callable[[], dict]] = None
+    ):
+        super().__init__()
+        self.export = export
+        self.file_prefix = file_prefix
+        self.tooltip = tooltip
+        self.get_params = get_params
+        self.job = None
+
+        # Creados una sola vez: build() se repite al volver a una vista en
+        # caché y el estado de una exportación en curso debe conservarse
+        self.button = ft.IconButton(
+            icon=ft.icons.DOWNLOAD,
+            tooltip=self.tooltip,
+            on_click=self._on_click
+        )
+        self.progress_bar = ft.ProgressBar(width=120, visible=False)
+        self.progress_text = ft.Text(size=12, visible=False)
+
+    def build(self):
+        return ft.Row([self.button, self.progress_bar, self.progress_text], spacing=5)
+
+    def _on_click(self, e):
+        if self.job and self.job.is_running():
+            # El hilo termina recién en el próximo lote: se suelta el trabajo
+            # para que el siguiente clic inicie una exportación nueva
+            self.job.cancel()
+            self.job = None
+            self._finish()
+            show_error_message(self.page, "Exportación cancelada.")
+            return
+        try:
+            params = self.get_params() if self.get_params else {}
+        except Exception as ex:
+            show_error_message(self.page, f"Error al exportar: {str(ex)}")
+            return
+
+        self.job = ExportJob(
+            self.export,
+            default_export_path(self.file_prefix),
+            on_progress=self._show_progress,
+            on_done=self._on_done,
+            on_error=self._on_error,
+            **params
+        )
+        self.button.icon = ft.icons.CANCEL
+        self.button.tooltip = "Cancelar exportación"
+        self.progress_bar.value = None
+        self.progress_bar.visible = True
+        self.progress_text.value = ""
+        self.progress_text.visible = True
+        self._refresh()
+        self.job.start()
+
+    def _show_progress(self, written: int, total: int):
+        self.progress_bar.value = written / total if total else None
+        self.progress_text.value = f"{written}/{total}"
+        self._refresh()
+
+    def _on_done(self, path, written: int):
+        self._finish()
+        show_success_message(self.page, f"{written} filas exportadas a {path}")
+
+    def _on_error(self, ex: Exception):
+        self._finish()
+        show_error_message(self.page, f"Error al exportar: {str(ex)}")
+
+    def _finish(self):
+        self.button.icon = ft.icons.DOWNLOAD
+        self.button.tooltip = self.tooltip
+        self.progress_bar.visible = False
+        self.progress_text.visible = False
+        self._refresh()
+
+    def _refresh(self):
+        # La exportación sigue aunque la vista ya no esté montada
+        if self.page:
+            self.update()
@@ -0,0 +1,88 @@
+"""
+Controles de paginación por cursor reutilizables
+"""
+import flet as ft
+from typing import Callable, Optional
+from services.pagination import Page, NEXT, PREV
+
+
+class KeysetPager(ft.UserControl):
+    """
+    Botones anterior/siguiente para listados paginados por cursor.
+
+    fetch_page(cursor, direction) debe devolver un Page del servicio y
+    on_items(items) se encarga de dibujar los elementos de la página.
+    """
+
+    def __init__(
+        self,
+        fetch_page: Callable[[Optional[tuple], str], Page],
+        on_items: Callable[[list], None]
+    ):
+        super().__init__()
+        self.fetch_page = fetch_page
+        self.on_items = on_items
+        self.page_number = 1
+        self.current = None
+        self._request = (None, NEXT)
+
+        self.prev_button = ft.IconButton(
+            icon=ft.icons.ARROW_BACK,
+            tooltip="Página anterior",
+            on_click=self.prev_page,
+            disabled=True
+        )
+        self.next_button = ft.IconButton(
+            icon=ft.icons.ARROW_FORWARD,
+            tooltip="Página siguiente",
+            on_click=self.next_page,
+            disabled=True
+        )
+        self.page_info = ft.Text(f"Página {self.page_number}")
+
+    def build(self):
+        return ft.Row([
+            self.prev_button,
+            self.page_info,
+            self.next_button
+        ], alignment=ft.MainAxisAlignment.CENTER)
+
+    def load_first(self):
+        """Carga la primera página"""
+        self.page_number = 1
+        self._load(None, NEXT)
+
+    def reload(self):
+        """Vuelve a cargar la página actual (por ejemplo, después de eliminar)"""
+        self._load(*self._request)
+        if not self.current.items and self._request[0] is not None:
+            self.load_first()
+
+    def next_page(self, e=None):
+        if self.current and self.current.next_cursor:
+            self.page_number += 1
+            self._load(self.current.next_cursor, NEXT)
+
+    def prev_page(self, e=None):
+        if self.current and self.current.prev_cursor:
+            self.page_number = max(1, self.page_number - 1)
+            self._load(self.current.prev_cursor, PREV)
+
+    def show_first(self, page: Page):
+        """Muestra una primera página obtenida fuera del paginador"""
+        self.page_number = 1
+        self._request = (None, NEXT)
+        self._show(page)
+
+    def _load(self, cursor, direction):
+        self._request = (cursor, direction)
+        self._show(self.fetch_page(cursor, direction))
+
+    def _show(self, page: Page):
+        self.current = page
+        self.prev_button.disabled = page.prev_cursor is None
+        self.next_button.disabled = page.next_cursor is None
+        self.page_info.value = f"Página {self.page_number}"
+        self.on_items(page.items)
+        if self.page:
+            self.update()
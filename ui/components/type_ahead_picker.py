@@ -0,0 +1,81 @@
+"""
+Selector con autocompletado que consulta solo las mejores coincidencias
+"""
+import flet as ft
+from typing import Callable, List, Tuple
+from ui.components.debounced_search import DebouncedSearch
+
+
+class TypeAheadPicker(ft.UserControl):
+    """
+    Campo de texto que muestra sugerencias a medida que se escribe.
+
+    search_fn recibe el texto ingresado y devuelve una lista de tuplas
+    (valor, texto). El valor seleccionado queda disponible en self.value.
+    """
+
+    def __init__(
+        self,
+        label: str,
+        search_fn: Callable[[str], List[Tuple[str, str]]],
+        width: int = 300,
+        min_chars: int = 1,
+        on_error=None
+    ):
+        super().__init__()
+        self.label = label
+        self.width = width
+        self.min_chars = min_chars
+        self.value = None
+        self.search = DebouncedSearch(search_fn, self._show_options, on_error=on_error)
+
+        # Flet vuelve a llamar a build() cada vez que el control se agrega a la
+        # página (vistas en caché): los controles hijos se crean una sola vez
+        self.text_field = ft.TextField(
+            label=self.label,
+            width=self.width,
+            prefix_icon=ft.icons.SEARCH,
+            on_change=self._on_change
+        )
+        self.options_list = ft.Column(spacing=0, visible=False, width=self.width)
+
+    def build(self):
+        return ft.Column([self.text_field, self.options_list], spacing=0)
+
+    def _on_change(self, e):
+        self.value = None
+        term = (e.control.value or "").strip()
+        if len(term) < self.min_chars:
+            self.search.cancel()
+            self._show_options([])
+            return
+        self.search.trigger(term)
+
+    def _show_options(self, options):
+        self.options_list.controls = [
+            ft.ListTile(
+                title=ft.Text(text),
+                dense=True,
+                on_click=lambda e, v=value, t=text: self._select(v, t)
+            ) for value, text in options
+        ]
+        self.options_list.visible = bool(options)
+        self.update()
+
+    def _select(self, value, text):
+        self.value = value
+        self.text_field.value = text
+        self.options_list.visible = False
+        self.update()
+
+    def clear(self):
+        """Limpia la selección y el texto ingresado"""
+        self.search.cancel()
+        self.value = None
+        self.text_field.value = ""
+        self.options_list.visible = False
+        self.update()
+
+    def cancel(self):
+        """Cancela las búsquedas pendientes"""
+        self.search.cancel()
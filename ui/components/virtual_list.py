@@ -0,0 +1,80 @@
+"""
+Lista virtualizada: solo materializa los controles de las filas visibles
+"""
+import flet as ft
+from typing import Any, Callable, List
+
+
+class VirtualList(ft.UserControl):
+    """
+    Lista de altura fija que reutiliza un conjunto pequeño de filas.
+
+    create_row() crea el control de una fila vacía (se llama una sola vez
+    por fila del conjunto) y bind_row(control, item) lo actualiza en el
+    lugar con los datos del elemento. Al desplazarse se vuelven a enlazar
+    las mismas filas y dos separadores mantienen la altura total, así el
+    árbol de controles no crece con el tamaño de la lista.
+    """
+
+    def __init__(
+        self,
+        create_row: Callable[[], ft.Control],
+        bind_row: Callable[[ft.Control, Any], None],
+        row_height: int = 48,
+        height: int = 480,
+        overscan: int = 5,
+        width: int = None
+    ):
+        super().__init__()
+        self.create_row = create_row
+        self.bind_row = bind_row
+        self.row_height = row_height
+        self.items: List[Any] = []
+        self.start = 0
+
+        pool_size = height // row_height + 1 + overscan
+        self.pool = [
+            ft.Container(content=create_row(), height=row_height, visible=False)
+            for _ in range(pool_size)
+        ]
+        self.top_spacer = ft.Container(height=0)
+        self.bottom_spacer = ft.Container(height=0)
+        self.list_view = ft.ListView(
+            controls=[self.top_spacer, *self.pool, self.bottom_spacer],
+            height=height,
+            width=width,
+            spacing=0,
+            on_scroll=self._on_scroll,
+            on_scroll_interval=50
+        )
+
+    def build(self):
+        return self.list_view
+
+    def set_items(self, items: List[Any]):
+        """Reemplaza los elementos y vuelve al inicio de la lista"""
+        self.items = list(items)
+        self.start = 0
+        self._bind()
+        if self.page:
+            self.list_view.scroll_to(offset=0)
+            self.update()
+
+    def _on_scroll(self, e):
+        start = max(0, int((e.pixels or 0) // self.row_height))
+        start = min(start, max(0, len(self.items) - len(self.pool)))
+        if start != self.start:
+            self.start = start
+            self._bind()
+            self.update()
+
+    def _bind(self):
+        window = self.items[self.start:self.start + len(self.pool)]
+        for slot, item in zip(self.pool, window):
+            self.bind_row(slot.content, item)
+            slot.visible = True
+        for slot in self.pool[len(window):]:
+            slot.visible = False
+        self.top_spacer.height = self.start * self.row_height
+        remaining = len(self.items) - self.start - len(window)
+        self.bottom_spacer.height = max(0, remaining) * self.row_height